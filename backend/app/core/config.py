@@ -1,5 +1,6 @@
 import os
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, List
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 
@@ -16,6 +17,18 @@ class Settings(BaseSettings):
     # Application
     app_name: str = "PetalClone API"
     debug: bool = False
+
+    # Where captured screenshots are persisted; served at /static/screenshots
+    screenshot_dir: str = "screenshots"
+
+    # Cap on simultaneous OpenAI vision requests; size to the account's
+    # rate limit so bursts queue client-side instead of drawing 429s
+    openai_max_concurrency: int = 32
+
+    # Names of ai_model_configs to race for the full HTML-generation
+    # step: the same prompt fires at every listed config and the first
+    # response wins. Empty (default) keeps the single streaming call.
+    race_model_configs: List[str] = []
     
     # API Keys - will be loaded from environment variables
     anthropic_api_key: Optional[str] = None
@@ -58,14 +71,24 @@ class Settings(BaseSettings):
 # Create global settings instance
 settings = Settings()
 
+# Cached result of the first validate_api_keys() run - the keys come from
+# the environment and do not change while the server is up
+_api_keys_valid: Optional[bool] = None
+
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings"""
+    """Get application settings (cached, FastAPI dependency-injection idiom)"""
     return settings
 
 
 def validate_api_keys():
-    """Validate that required API keys are available"""
+    """Validate that required API keys are available (validates once)"""
+    global _api_keys_valid
+
+    if _api_keys_valid is not None:
+        return _api_keys_valid
+
     missing_keys = []
     
     if not settings.anthropic_api_key:
@@ -80,7 +103,9 @@ def validate_api_keys():
     if missing_keys:
         print(f"⚠️  Missing API keys: {', '.join(missing_keys)}")
         print("   Add them as environment variables or create a .env file")
-        return False
-    
-    print("✅ All API keys configured successfully")
-    return True 
\ No newline at end of file
+        _api_keys_valid = False
+    else:
+        print("✅ All API keys configured successfully")
+        _api_keys_valid = True
+
+    return _api_keys_valid 
\ No newline at end of file
@@ -1,7 +1,12 @@
 import asyncio
-from typing import Dict, List, Callable
+from collections import deque
+from typing import Deque, Dict, List, Callable
 
-_job_logs: Dict[str, List[str]] = {}
+# Per-job history is a ring buffer: very chatty jobs keep only the most
+# recent lines instead of pinning the whole log in RAM
+MAX_LOG_HISTORY = 500
+
+_job_logs: Dict[str, Deque[str]] = {}
 _log_listeners: Dict[str, List[asyncio.Queue]] = {}
 
 
@@ -96,7 +101,7 @@ class LiveLogger:
     def __init__(self, job_id: str):
         self.job_id = job_id
         if self.job_id not in _job_logs:
-            _job_logs[self.job_id] = []
+            _job_logs[self.job_id] = deque(maxlen=MAX_LOG_HISTORY)
         if self.job_id not in _log_listeners:
             _log_listeners[self.job_id] = []
 
@@ -107,11 +112,15 @@ class LiveLogger:
         print(log_message)  # Also print to server console for debugging
         
         _job_logs[self.job_id].append(message)
-        
-        # Notify all listeners for this job
-        if self.job_id in _log_listeners:
-            for queue in _log_listeners[self.job_id]:
-                await queue.put(message)
+
+        # Notify all listeners for this job without awaiting any of them:
+        # a slow subscriber must not stall the producer or its peers.
+        # A listener whose bounded queue is full is dropped.
+        for queue in list(_log_listeners.get(self.job_id, [])):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                _log_listeners[self.job_id].remove(queue)
 
     @staticmethod
     async def subscribe(job_id: str):
@@ -119,23 +128,30 @@ class LiveLogger:
         A generator that yields logs for a specific job for SSE.
         First, it yields all historical logs, then waits for new ones.
         """
-        queue = asyncio.Queue()
+        queue = asyncio.Queue(maxsize=1024)
         if job_id not in _log_listeners:
             _log_listeners[job_id] = []
         _log_listeners[job_id].append(queue)
         
         try:
-            # Yield all existing logs for this job
+            # Yield the retained history for this job (ring buffer, so a
+            # late subscriber may only see the most recent lines)
             if job_id in _job_logs:
-                for log in _job_logs[job_id]:
+                for log in list(_job_logs[job_id]):
                     yield f"data: {log}\n\n"
-                    await asyncio.sleep(0.01)
 
-            # Wait for new logs and yield them
+            # Wait for new logs and yield them, coalescing bursts into a
+            # single SSE write instead of one wakeup + write per line
             while True:
-                log = await queue.get()
-                yield f"data: {log}\n\n"
-                if log == "[END]":
+                batch = [await queue.get()]
+                try:
+                    while len(batch) < 64:
+                        batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    pass
+
+                yield "".join(f"data: {log}\n\n" for log in batch)
+                if "[END]" in batch:
                     break
         finally:
             # Clean up the queue when the client disconnects or stream ends
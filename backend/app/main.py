@@ -1,6 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import os
 import uvicorn
 from dotenv import load_dotenv
 
@@ -25,9 +28,18 @@ async def lifespan(app: FastAPI):
         print("   The app will still work with mock data for testing.")
     
     yield
-    
+
     # Shutdown logic
     print("🌸 PetalClone API shutting down...")
+    # Close the LLM clients' shared connection pool cleanly
+    from .services.llm_clients import LLMClientFactory
+    await LLMClientFactory.aclose()
+    # And the warm browser pool the scrapers share
+    from .services.browser_pool import close_browser_pool
+    await close_browser_pool()
+    # And the shared OpenAI vision client
+    from .services.vision_cloner import close_vision_http_client
+    await close_vision_http_client()
 
 
 # Create FastAPI instance
@@ -35,7 +47,10 @@ app = FastAPI(
     title="PetalClone API",
     description="AI-powered website cloning with agentic architecture",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson is several times faster than stdlib json for the large
+    # clone-result payloads and handles datetime natively
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -47,6 +62,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Serve persisted screenshots by URL so responses can reference them
+# instead of embedding base64 blobs
+os.makedirs(settings.screenshot_dir, exist_ok=True)
+app.mount(
+    "/static/screenshots",
+    StaticFiles(directory=settings.screenshot_dir),
+    name="screenshots",
+)
+
 # Include routers
 app.include_router(clone.router, prefix="/api/v1", tags=["clone"])
 
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, HttpUrl, ConfigDict, Field
+from pydantic import BaseModel, HttpUrl, ConfigDict, Field, PrivateAttr
 from typing import Optional, Dict, Any, List
 from enum import Enum
 from datetime import datetime
+import base64
 
 
 class CloneStatus(str, Enum):
@@ -30,14 +31,104 @@ class ScrapeMetadata(BaseModel):
     assets_count: int = 0
 
 
+# Vision APIs downscale internally anyway (Claude's useful maximum is
+# 1568px on the long edge), so shipping a full-resolution PNG only adds
+# upload bytes. Screenshots are resized to this and re-encoded as WebP
+# before base64 embedding - typically a 3-10x byte reduction.
+_MAX_VISION_DIM = 1568
+
+
+# At or under this long edge, gpt-4o's detail:"low" (one fixed 85-token
+# tile) sees the whole image anyway; "high" would tile it into 512px
+# patches at ~170 tokens each for no added fidelity
+_LOW_DETAIL_DIM = 768
+
+
+def _compress_screenshot(raw: bytes) -> tuple:
+    """Downscale a raw screenshot and re-encode it as WebP for vision input.
+
+    Returns (bytes, media_type, long_edge).
+    """
+    import io
+    from PIL import Image
+
+    img = Image.open(io.BytesIO(raw))
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    # Lanczos keeps small text legible after the downscale, which is
+    # what the vision model reads layout from
+    img.thumbnail((_MAX_VISION_DIM, _MAX_VISION_DIM), Image.Resampling.LANCZOS)
+    buf = io.BytesIO()
+    img.save(buf, "WEBP", quality=85)
+    return buf.getvalue(), "image/webp", max(img.size)
+
+
 class ScrapeResult(BaseModel):
     url: str
     html: str
     css: Optional[str] = None
     screenshot: Optional[str] = None  # base64 encoded
+    # Raw screenshot bytes as captured by the scraper. Kept out of
+    # serialized output; base64 is produced lazily via screenshot_b64 so
+    # the 1.33x encoded copy only exists for consumers that ask for it.
+    screenshot_bytes: Optional[bytes] = Field(default=None, exclude=True, repr=False)
+    screenshot_media_type: str = "image/png"
     metadata: ScrapeMetadata
     assets: List[Dict[str, Any]] = []
 
+    _screenshot_data_url: Optional[str] = PrivateAttr(default=None)
+    _html_snippet: Optional[str] = PrivateAttr(default=None)
+    _screenshot_long_edge: Optional[int] = PrivateAttr(default=None)
+
+    @property
+    def html_snippet(self) -> str:
+        """First 2KB of the page HTML for prompt context, sliced once.
+
+        Slicing a multi-MB non-ASCII str by codepoints scans for the
+        boundary, so retries and multi-step prompts share one cut.
+        """
+        if self._html_snippet is None:
+            self._html_snippet = self.html[:2000]
+        return self._html_snippet
+
+    @property
+    def screenshot_b64(self) -> Optional[str]:
+        """Base64 screenshot, compressed and encoded on first access, cached."""
+        if self.screenshot is None and self.screenshot_bytes is not None:
+            try:
+                payload, self.screenshot_media_type, self._screenshot_long_edge = (
+                    _compress_screenshot(self.screenshot_bytes)
+                )
+            except Exception:
+                # Undecodable capture: ship the original bytes unchanged
+                payload = self.screenshot_bytes
+            self.screenshot = base64.b64encode(payload).decode('ascii')
+        return self.screenshot
+
+    @property
+    def screenshot_data_url(self) -> Optional[str]:
+        """Data URI for vision prompts, concatenated once and shared.
+
+        Each agent step embeds the screenshot; without this cache every
+        prompt build copies the multi-hundred-KB base64 string again.
+        """
+        if self._screenshot_data_url is None and self.screenshot_b64:
+            self._screenshot_data_url = (
+                f"data:{self.screenshot_media_type};base64,{self.screenshot_b64}"
+            )
+        return self._screenshot_data_url
+
+    @property
+    def vision_detail(self) -> str:
+        """Image detail level for vision prompts: "low" when the
+        compressed capture fits in a single low-detail tile, else "high"."""
+        if (
+            self._screenshot_long_edge is not None
+            and self._screenshot_long_edge <= _LOW_DETAIL_DIM
+        ):
+            return "low"
+        return "high"
+
 
 class LLMCloneResult(BaseModel):
     html: str
@@ -2,11 +2,14 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, HttpUrl
 from typing import Optional, Dict, Any, List
+from collections import OrderedDict
 import uuid
 import json
+import time
 import asyncio
 from datetime import datetime
 import os
+import zipfile
 
 from ..services.scraper import Scraper
 from ..services.llm import LLMService
@@ -16,11 +19,52 @@ from ..core.logging import LiveLogger
 
 router = APIRouter()
 
-# In-memory storage for demo (replace with database in production)
-clone_jobs: Dict[str, Dict[str, Any]] = {}
+# How long finished jobs stay queryable before eviction
+JOB_TTL_SECONDS = 3600.0
+MAX_JOBS = 1024
+
+
+class _TTLJobStore(OrderedDict):
+    """
+    Bounded in-memory job store with LRU + TTL eviction.
+
+    A long-running server must not grow without bound, so the oldest jobs
+    are dropped once maxsize is reached and entries expire after ttl
+    seconds. (Still a demo store - replace with a database in production.)
+    """
+
+    def __init__(self, maxsize: int = MAX_JOBS, ttl: float = JOB_TTL_SECONDS):
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._expiry: Dict[str, float] = {}
+
+    def __setitem__(self, key, value):
+        self._evict()
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        self._expiry[key] = time.monotonic() + self.ttl
+
+    def __contains__(self, key):
+        expiry = self._expiry.get(key)
+        if expiry is not None and expiry < time.monotonic():
+            self.pop(key, None)
+        return super().__contains__(key)
+
+    def pop(self, key, *default):
+        self._expiry.pop(key, None)
+        return super().pop(key, *default)
+
+    def _evict(self):
+        now = time.monotonic()
+        for key in [k for k, expiry in self._expiry.items() if expiry < now]:
+            self.pop(key, None)
+        while len(self) >= self.maxsize:
+            self.pop(next(iter(self)), None)
 
-# Live logs storage
-live_logs: Dict[str, List[str]] = {}  # job_id -> list of log messages
+
+# In-memory storage for demo (replace with database in production)
+clone_jobs: _TTLJobStore = _TTLJobStore()
 
 
 class CloneJobCreate(BaseModel):
@@ -55,8 +99,9 @@ async def create_clone_job(
     }
     clone_jobs[job_id] = job_data
     
-    # Start background processing
-    clone_request = CloneRequest(**request.dict())
+    # Start background processing. The payload already passed
+    # CloneJobCreate validation, so skip re-validating identical fields
+    clone_request = CloneRequest.model_construct(**request.model_dump())
     background_tasks.add_task(process_clone_job, job_id, clone_request)
     
     return CloneJobResponse(**job_data)
@@ -104,6 +149,7 @@ async def process_clone_job(job_id: str, request: CloneRequest):
             "updated_at": datetime.utcnow()
         })
 
+    scraper_service = None
     try:
         if request.full_site:
             await logger.log("🚀 Initializing full site clone...")
@@ -112,7 +158,7 @@ async def process_clone_job(job_id: str, request: CloneRequest):
             full_site_result = await full_site_scraper.clone_full_website(request)
             
             # Update job with full site result
-            clone_jobs[job_id]["full_site_result"] = full_site_result.dict()
+            clone_jobs[job_id]["full_site_result"] = full_site_result.model_dump()
         else:
             await logger.log("🚀 Initializing single page clone...")
             update_status("scraping", "📄 Scraping single page...")
@@ -126,7 +172,7 @@ async def process_clone_job(job_id: str, request: CloneRequest):
             clone_result = await llm_service.clone_website(
                 scrape_data=scrape_result, model=request.model, logger=logger
             )
-            clone_jobs[job_id]["result"] = clone_result.dict()
+            clone_jobs[job_id]["result"] = clone_result.model_dump()
         
         update_status("completed", "✅ Clone completed!")
         
@@ -136,7 +182,90 @@ async def process_clone_job(job_id: str, request: CloneRequest):
         update_status("failed", error_message)
         clone_jobs[job_id]["error"] = str(e)
     finally:
+        # Single-page jobs own their Scraper; close its HTTP pool and any
+        # Hyperbrowser fallback session (full-site jobs tear down inside
+        # clone_full_website)
+        if scraper_service is not None:
+            await scraper_service.aclose()
         await logger.log("[END]")
+        # Release job state and log buffers well before the TTL kicks in;
+        # clients have 10 minutes to fetch the finished result
+        asyncio.get_running_loop().call_later(
+            600, lambda: (clone_jobs.pop(job_id, None), LiveLogger.cleanup(job_id))
+        )
+
+
+class _ZipChunkBuffer:
+    """
+    Minimal write-only sink for zipfile: collects the bytes written for
+    each archive entry so the generator below can yield them as they are
+    produced. zipfile detects the missing seek() and switches to its
+    streaming (data-descriptor) mode.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        chunks, self._chunks = self._chunks, []
+        return b"".join(chunks)
+
+
+def _stream_site_zip(full_site_result: Dict[str, Any]):
+    """Yield a full-site clone as ZIP chunks, one page at a time"""
+
+    buffer = _ZipChunkBuffer()
+
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        written_paths = set()
+
+        for page in full_site_result.get("pages", []):
+            path = page.get("path", "/")
+
+            # Normalize path to create a file path
+            file_path = path.strip('/')
+
+            if not file_path:
+                # Root path, e.g., /
+                file_path = "index.html"
+            elif path.endswith('/'):
+                # Directory-like URL, e.g., /about/
+                file_path = f"{file_path}/index.html"
+            elif not os.path.splitext(file_path)[1]:
+                # No file extension, e.g., /about
+                file_path = f"{file_path}.html"
+
+            if file_path in written_paths:
+                continue
+
+            # Pages with inlined assets are mostly base64 - DEFLATE gains
+            # ~nothing there, so store them raw; plain HTML still gets a
+            # cheap level-1 DEFLATE
+            html = page["html"]
+            if "base64," in html[:200_000]:
+                zip_file.writestr(file_path, html, compress_type=zipfile.ZIP_STORED)
+            else:
+                zip_file.writestr(
+                    file_path, html,
+                    compress_type=zipfile.ZIP_DEFLATED, compresslevel=1
+                )
+            written_paths.add(file_path)
+            yield buffer.drain()
+
+        # Add sitemap
+        sitemap_content = "\n".join(full_site_result.get("sitemap", []))
+        if sitemap_content:
+            zip_file.writestr("sitemap.txt", sitemap_content)
+
+    # Remaining entry bytes plus the central directory
+    yield buffer.drain()
 
 
 @router.get("/clone/{job_id}/download")
@@ -152,48 +281,10 @@ async def download_cloned_site(job_id: str):
         raise HTTPException(status_code=400, detail="Clone job not completed")
     
     if job_data.get("full_site_result"):
-        # Full site download
-        import zipfile
-        import io
-        
-        zip_buffer = io.BytesIO()
-        
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            full_site_result = job_data["full_site_result"]
-            written_paths = set()
-
-            for page in full_site_result.get("pages", []):
-                path = page.get("path", "/")
-
-                # Normalize path to create a file path
-                file_path = path.strip('/')
-                
-                if not file_path:
-                    # Root path, e.g., /
-                    file_path = "index.html"
-                elif path.endswith('/'):
-                    # Directory-like URL, e.g., /about/
-                    file_path = f"{file_path}/index.html"
-                elif not os.path.splitext(file_path)[1]:
-                    # No file extension, e.g., /about
-                    file_path = f"{file_path}.html"
-
-                if file_path in written_paths:
-                    continue
-                
-                zip_file.writestr(file_path, page["html"])
-                written_paths.add(file_path)
-
-            # Add sitemap
-            sitemap_content = "\n".join(full_site_result.get("sitemap", []))
-            if sitemap_content:
-                zip_file.writestr("sitemap.txt", sitemap_content)
-        
-        zip_buffer.seek(0)
-        
-        from fastapi.responses import Response
-        return Response(
-            content=zip_buffer.getvalue(),
+        # Full site download - streamed, so the whole archive is never
+        # buffered in memory and the first bytes go out immediately
+        return StreamingResponse(
+            _stream_site_zip(job_data["full_site_result"]),
             media_type="application/zip",
             headers={"Content-Disposition": f"attachment; filename=cloned_site_{job_id}.zip"}
         )
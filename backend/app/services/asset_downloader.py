@@ -1,263 +1,414 @@
 import asyncio
-import base64
+import binascii
 import mimetypes
 from typing import Dict, List, Set, Optional
 from urllib.parse import urljoin, urlparse
 import httpx
-from bs4 import BeautifulSoup
+from lxml import html as lxml_html
 import re
 
+# Compiled once at import; shared by the CSS processor and style rewriters
+_URL_RE = re.compile(r'url\(["\']?([^"\')\s]+)["\']?\)')
+_BG_RE = re.compile(r'background-image:\s*url\(["\']?([^"\')\s]+)["\']?\)')
+
+# Memory guard rails: an oversized (or hostile) asset is left as an
+# external reference instead of being embedded
+MAX_ASSET_BYTES = 5 * 1024 * 1024   # 5 MB per asset
+MAX_TOTAL_BYTES = 50 * 1024 * 1024  # 50 MB per job
+MAX_FONT_BYTES = 200_000            # Skip oversized font variants
+
+# Fast path for the extensions web assets actually use; mimetypes.guess_type
+# parses the URL and hits the OS mime database on every call
+_MIME_TYPES = {
+    'png': 'image/png',
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'gif': 'image/gif',
+    'webp': 'image/webp',
+    'svg': 'image/svg+xml',
+    'ico': 'image/x-icon',
+    'woff': 'font/woff',
+    'woff2': 'font/woff2',
+    'ttf': 'font/ttf',
+    'otf': 'font/otf',
+    'css': 'text/css',
+    'js': 'application/javascript',
+}
+
 
 class AssetDownloader:
     """Downloads and embeds all external assets for complete offline clones"""
-    
+
     def __init__(self):
         self.timeout = httpx.Timeout(30.0)
         self.downloaded_assets: Dict[str, str] = {}  # URL -> base64 content
-        self.asset_cache: Dict[str, bytes] = {}     # URL -> raw bytes
+        self.asset_cache: Dict[str, str] = {}       # URL -> data URI
         self.processed_urls: Set[str] = set()
-        
+        self._client: Optional[httpx.AsyncClient] = None
+        self._sem = asyncio.Semaphore(16)  # Bound concurrent text downloads
+        self._queue: Optional[asyncio.Queue] = None  # Binary download queue
+        self._total_bytes = 0
+        self._styled_elements: List = []
+
     async def download_and_embed_assets(self, html: str, base_url: str) -> str:
         """
         Download all external assets and embed them inline for offline use
-        
+
         Args:
             html: Original HTML content
             base_url: Base URL for resolving relative paths
-            
+
         Returns:
             HTML with all assets embedded inline
         """
-        
+
         print(f"📦 Starting comprehensive asset download for {base_url}")
-        
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Download all asset types
-        await self._download_stylesheets(soup, base_url)
-        await self._download_images(soup, base_url)
-        await self._download_scripts(soup, base_url)
-        await self._download_fonts(soup, base_url)
-        
+
+        # lxml's C parser is an order of magnitude faster than bs4's
+        # pure-Python html.parser and much lighter per node. Parse off the
+        # event loop so a multi-MB page doesn't stall other jobs' I/O
+        tree = await asyncio.to_thread(lxml_html.document_fromstring, html)
+
+        # Walk the tree for style attributes once; both the download and
+        # embed phases iterate this list instead of re-traversing
+        self._styled_elements = tree.xpath('//*[@style]')
+
+        # One pooled client for every asset on the page - connections are
+        # reused (keep-alive) instead of paying a TCP+TLS handshake per URL
+        async with httpx.AsyncClient(
+            timeout=self.timeout,
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            }
+        ) as client:
+            self._client = client
+
+            # Binary assets flow through a bounded queue into a fixed worker
+            # pool: producers block when the queue is full (backpressure)
+            # instead of materializing a coroutine per asset up front
+            self._queue = asyncio.Queue(maxsize=128)
+            workers = [asyncio.create_task(self._binary_worker()) for _ in range(16)]
+
+            try:
+                # Download all asset types concurrently
+                await asyncio.gather(
+                    self._download_stylesheets(tree, base_url),
+                    self._download_images(tree, base_url),
+                    self._download_scripts(tree, base_url),
+                    self._download_fonts(tree, base_url)
+                )
+                await self._queue.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                self._queue = None
+
+        self._client = None
+
         # Embed assets into HTML
-        self._embed_stylesheets(soup)
-        self._embed_images(soup)
-        self._embed_scripts(soup)
-        
+        self._embed_stylesheets(tree, base_url)
+        self._embed_images(tree, base_url)
+        self._embed_scripts(tree, base_url)
+
         print(f"✅ Asset embedding complete: {len(self.downloaded_assets)} assets processed")
-        
-        return str(soup)
-    
-    async def _download_stylesheets(self, soup: BeautifulSoup, base_url: str):
+
+        # Serialization of the embedded document is CPU-bound too
+        result = await asyncio.to_thread(lxml_html.tostring, tree, encoding='unicode')
+
+        # Everything is embedded in the output now - release the caches so
+        # a long-lived downloader (full-site clones) doesn't pin every
+        # page's assets in memory, and reset the per-job byte budget
+        self.asset_cache.clear()
+        self.downloaded_assets.clear()
+        self.processed_urls.clear()
+        self._styled_elements = []
+        self._total_bytes = 0
+
+        return result
+
+    async def _download_stylesheets(self, tree, base_url: str):
         """Download and process CSS files"""
-        
+
         print("🎨 Downloading stylesheets...")
-        
-        css_links = soup.find_all('link', {'rel': 'stylesheet'})
-        
-        for link in css_links:
+
+        css_urls = []
+        for link in tree.xpath('//link[@rel="stylesheet"]'):
             href = link.get('href')
             if href:
                 css_url = urljoin(base_url, href)
-                
                 if css_url not in self.processed_urls:
-                    css_content = await self._download_asset(css_url, 'text/css')
-                    if css_content:
-                        # Process CSS to download referenced assets
-                        processed_css = await self._process_css_assets(css_content, css_url)
-                        self.downloaded_assets[css_url] = processed_css
-                        self.processed_urls.add(css_url)
-    
-    async def _download_images(self, soup: BeautifulSoup, base_url: str):
+                    self.processed_urls.add(css_url)
+                    css_urls.append(css_url)
+
+        # Wave 1: fetch every stylesheet text concurrently
+        css_texts = await asyncio.gather(
+            *(self._download_asset(url, 'text/css') for url in css_urls),
+            return_exceptions=True
+        )
+
+        # Wave 2: extract url() refs from all stylesheets into one global
+        # set and download them together, instead of per-file serial awaits
+        fetched = []
+        referenced: Set[str] = set()
+        for css_url, css_content in zip(css_urls, css_texts):
+            if isinstance(css_content, str) and css_content:
+                fetched.append((css_url, css_content))
+                referenced |= {
+                    urljoin(css_url, url) for url in _URL_RE.findall(css_content)
+                }
+
+        referenced -= self.asset_cache.keys()
+        await self._enqueue_binary_downloads(referenced)
+
+        # Wave 3: pure-CPU substitution pass per stylesheet
+        for css_url, css_content in fetched:
+            self.downloaded_assets[css_url] = self._rewrite_css(css_content, css_url)
+
+    async def _download_images(self, tree, base_url: str):
         """Download all images"""
-        
+
         print("🖼️ Downloading images...")
-        
+
+        # Collect unique URLs first - pages reuse the same logo/sprite dozens
+        # of times and a duplicate coroutine still costs a semaphore acquire
+        urls: Set[str] = set()
+
         # Regular img tags
-        images = soup.find_all('img')
-        for img in images:
+        for img in tree.xpath('//img[@src]'):
             src = img.get('src')
             if src:
-                img_url = urljoin(base_url, src)
-                await self._download_and_cache_binary_asset(img_url)
-        
+                urls.add(urljoin(base_url, src))
+
         # Background images in inline styles
-        elements_with_style = soup.find_all(attrs={"style": True})
-        for element in elements_with_style:
+        for element in self._styled_elements:
             style = element.get('style', '')
-            bg_urls = re.findall(r'background-image:\s*url\(["\']?([^"\')\s]+)["\']?\)', style)
-            for bg_url in bg_urls:
-                full_url = urljoin(base_url, bg_url)
-                await self._download_and_cache_binary_asset(full_url)
-    
-    async def _download_scripts(self, soup: BeautifulSoup, base_url: str):
+            for bg_url in _BG_RE.findall(style):
+                urls.add(urljoin(base_url, bg_url))
+
+        urls -= self.asset_cache.keys()
+        await self._enqueue_binary_downloads(urls)
+
+    async def _download_scripts(self, tree, base_url: str):
         """Download JavaScript files"""
-        
+
         print("⚙️ Downloading scripts...")
-        
-        scripts = soup.find_all('script', src=True)
-        
-        for script in scripts:
+
+        async def fetch_script(script_url: str):
+            js_content = await self._download_asset(script_url, 'application/javascript')
+            if js_content:
+                self.downloaded_assets[script_url] = js_content
+
+        tasks = []
+        for script in tree.xpath('//script[@src]'):
             src = script.get('src')
             if src:
                 script_url = urljoin(base_url, src)
-                
+
                 if script_url not in self.processed_urls:
-                    js_content = await self._download_asset(script_url, 'application/javascript')
-                    if js_content:
-                        self.downloaded_assets[script_url] = js_content
-                        self.processed_urls.add(script_url)
-    
-    async def _download_fonts(self, soup: BeautifulSoup, base_url: str):
+                    self.processed_urls.add(script_url)
+                    tasks.append(fetch_script(script_url))
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _download_fonts(self, tree, base_url: str):
         """Download font files from CSS and link tags"""
-        
+
         print("🔤 Downloading fonts...")
-        
+
+        async def fetch_font_css(font_css_url: str):
+            if 'googleapis.com/css' in font_css_url:
+                # Ask for the compact woff2-only stylesheet; a non-browser
+                # UA makes Google Fonts return the fat multi-format CSS
+                if 'display=' not in font_css_url:
+                    sep = '&' if '?' in font_css_url else '?'
+                    font_css_url = f"{font_css_url}{sep}display=swap"
+
+            font_css = await self._download_asset(font_css_url, 'text/css')
+            if font_css:
+                # Download actual font files referenced in CSS
+                processed_font_css = await self._process_css_assets(font_css, font_css_url)
+                self.downloaded_assets[font_css_url] = processed_font_css
+
+        tasks = []
         # Font links (Google Fonts, etc.)
-        font_links = soup.find_all('link', href=True)
-        
-        for link in font_links:
+        for link in tree.xpath('//link[@href]'):
             href = link.get('href', '')
             if 'font' in href.lower() or 'googleapis.com/css' in href:
                 font_css_url = urljoin(base_url, href)
-                
+
                 if font_css_url not in self.processed_urls:
-                    font_css = await self._download_asset(font_css_url, 'text/css')
-                    if font_css:
-                        # Download actual font files referenced in CSS
-                        processed_font_css = await self._process_css_assets(font_css, font_css_url)
-                        self.downloaded_assets[font_css_url] = processed_font_css
-                        self.processed_urls.add(font_css_url)
-    
+                    self.processed_urls.add(font_css_url)
+                    tasks.append(fetch_font_css(font_css_url))
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _binary_worker(self):
+        """Consume binary asset URLs from the queue until cancelled"""
+
+        while True:
+            url = await self._queue.get()
+            try:
+                await self._download_and_cache_binary_asset(url)
+            except Exception as e:
+                print(f"⚠️ Worker failed on {url}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    async def _enqueue_binary_downloads(self, urls: Set[str]):
+        """Feed URLs to the worker pool and wait for the queue to drain"""
+
+        for url in urls:
+            await self._queue.put(url)
+        await self._queue.join()
+
     async def _process_css_assets(self, css_content: str, css_base_url: str) -> str:
         """Process CSS and download referenced assets (fonts, images)"""
-        
-        # Find all url() references in CSS
-        url_pattern = r'url\(["\']?([^"\')\s]+)["\']?\)'
-        urls = re.findall(url_pattern, css_content)
-        
-        for url in urls:
-            full_url = urljoin(css_base_url, url)
-            
-            # Download the asset
-            await self._download_and_cache_binary_asset(full_url)
-            
-            # Replace URL in CSS with data URI
+
+        # Find all url() references in CSS and download them concurrently,
+        # skipping anything another stylesheet already pulled in
+        urls = {urljoin(css_base_url, url) for url in _URL_RE.findall(css_content)}
+        urls -= self.asset_cache.keys()
+        await self._enqueue_binary_downloads(urls)
+
+        return self._rewrite_css(css_content, css_base_url)
+
+    def _rewrite_css(self, css_content: str, css_base_url: str) -> str:
+        """Swap downloaded url() references for data URIs in one sub pass"""
+
+        # Single substitution pass: O(len(css)) instead of one str.replace
+        # per reference, and a URL that prefixes another is never mangled
+        def repl(match):
+            full_url = urljoin(css_base_url, match.group(1))
             if full_url in self.asset_cache:
-                data_uri = self._create_data_uri(full_url, self.asset_cache[full_url])
-                css_content = css_content.replace(url, data_uri)
-        
-        return css_content
-    
+                return f'url({self.asset_cache[full_url]})'
+            return match.group(0)
+
+        return _URL_RE.sub(repl, css_content)
+
     async def _download_asset(self, url: str, content_type: str) -> Optional[str]:
         """Download a text asset (CSS, JS)"""
-        
+
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers={
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-                })
-                
-                if response.status_code == 200:
-                    return response.text
-                
+            async with self._sem:
+                response = await self._client.get(url)
+
+            if response.status_code == 200:
+                return response.text
+
         except Exception as e:
             print(f"⚠️ Failed to download {url}: {str(e)}")
-        
+
         return None
-    
+
     async def _download_and_cache_binary_asset(self, url: str):
         """Download and cache binary assets (images, fonts)"""
-        
+
         if url in self.asset_cache:
             return
-        
+
+        if self._total_bytes >= MAX_TOTAL_BYTES:
+            return
+
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers={
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-                })
-                
-                if response.status_code == 200:
-                    self.asset_cache[url] = response.content
-                    print(f"✅ Downloaded asset: {url} ({len(response.content)} bytes)")
-                
+            # Fonts get a cheap HEAD pre-check: Google Fonts CSS can
+            # reference many large variants the page never renders
+            if url.rpartition('.')[2].lower() in ('woff', 'woff2', 'ttf', 'otf'):
+                head = await self._client.head(url)
+                content_length = int(head.headers.get('content-length') or 0)
+                if content_length > MAX_FONT_BYTES:
+                    print(f"⚠️ Skipping oversized font: {url} ({content_length} bytes)")
+                    return
+
+            async with self._client.stream("GET", url) as response:
+                if response.status_code != 200:
+                    return
+
+                # Stream into a buffer so an oversized asset is aborted
+                # early instead of materializing gigabytes in memory
+                content = bytearray()
+                async for chunk in response.aiter_bytes():
+                    content.extend(chunk)
+                    if len(content) > MAX_ASSET_BYTES:
+                        print(f"⚠️ Skipping oversized asset: {url} (> {MAX_ASSET_BYTES} bytes)")
+                        return
+
+            if self._total_bytes + len(content) > MAX_TOTAL_BYTES:
+                print(f"⚠️ Asset budget exhausted, keeping external reference: {url}")
+                return
+
+            self._total_bytes += len(content)
+            # Encode to a data URI immediately and drop the raw bytes so
+            # we never hold both representations of a large asset
+            self.asset_cache[url] = self._create_data_uri(url, bytes(content))
+            print(f"✅ Downloaded asset: {url} ({len(content)} bytes)")
+
         except Exception as e:
             print(f"⚠️ Failed to download asset {url}: {str(e)}")
-    
+
     def _create_data_uri(self, url: str, content: bytes) -> str:
         """Create a data URI from binary content"""
-        
-        # Guess MIME type from URL
-        mime_type, _ = mimetypes.guess_type(url)
+
+        # Guess MIME type from the extension, consulting mimetypes only on
+        # a miss (it's comparatively slow per call)
+        ext = url.rpartition('.')[2].lower()
+        mime_type = _MIME_TYPES.get(ext)
         if not mime_type:
-            # Default MIME types for common assets
-            if url.endswith(('.woff', '.woff2')):
-                mime_type = 'font/woff2'
-            elif url.endswith('.ttf'):
-                mime_type = 'font/ttf'
-            elif url.endswith('.otf'):
-                mime_type = 'font/otf'
-            else:
-                mime_type = 'application/octet-stream'
-        
-        # Create base64 data URI
-        b64_content = base64.b64encode(content).decode('utf-8')
+            mime_type = mimetypes.guess_type(url)[0] or 'application/octet-stream'
+
+        # Create base64 data URI (b2a_base64 is faster than base64.b64encode)
+        b64_content = binascii.b2a_base64(content, newline=False).decode('ascii')
         return f"data:{mime_type};base64,{b64_content}"
-    
-    def _embed_stylesheets(self, soup: BeautifulSoup):
+
+    def _embed_stylesheets(self, tree, base_url: str):
         """Replace external CSS links with inline styles"""
-        
-        css_links = soup.find_all('link', {'rel': 'stylesheet'})
-        
-        for link in css_links:
+
+        for link in tree.xpath('//link[@rel="stylesheet"]'):
             href = link.get('href')
             if href:
-                css_url = urljoin(soup.find('base').get('href', ''), href) if soup.find('base') else href
-                
+                css_url = urljoin(base_url, href)
+
                 if css_url in self.downloaded_assets:
                     # Create inline style tag
-                    style_tag = soup.new_tag('style')
-                    style_tag.string = self.downloaded_assets[css_url]
-                    
+                    style_tag = lxml_html.Element('style')
+                    style_tag.text = self.downloaded_assets[css_url]
+
                     # Replace link with style tag
-                    link.replace_with(style_tag)
-    
-    def _embed_images(self, soup: BeautifulSoup):
+                    link.getparent().replace(link, style_tag)
+
+    def _embed_images(self, tree, base_url: str):
         """Replace image sources with data URIs"""
-        
-        images = soup.find_all('img')
-        
-        for img in images:
+
+        for img in tree.xpath('//img[@src]'):
             src = img.get('src')
-            if src and src in self.asset_cache:
-                data_uri = self._create_data_uri(src, self.asset_cache[src])
-                img['src'] = data_uri
-        
+            if src:
+                img_url = urljoin(base_url, src)
+                if img_url in self.asset_cache:
+                    img.set('src', self.asset_cache[img_url])
+
         # Handle background images in inline styles
-        elements_with_style = soup.find_all(attrs={"style": True})
-        for element in elements_with_style:
+        for element in self._styled_elements:
             style = element.get('style', '')
-            
+
             # Replace background-image URLs with data URIs
             def replace_bg_url(match):
-                url = match.group(1)
+                url = urljoin(base_url, match.group(1))
                 if url in self.asset_cache:
-                    data_uri = self._create_data_uri(url, self.asset_cache[url])
-                    return f'url({data_uri})'
+                    return f'url({self.asset_cache[url]})'
                 return match.group(0)
-            
-            new_style = re.sub(r'url\(["\']?([^"\')\s]+)["\']?\)', replace_bg_url, style)
-            element['style'] = new_style
-    
-    def _embed_scripts(self, soup: BeautifulSoup):
+
+            new_style = _URL_RE.sub(replace_bg_url, style)
+            element.set('style', new_style)
+
+    def _embed_scripts(self, tree, base_url: str):
         """Replace external scripts with inline scripts"""
-        
-        scripts = soup.find_all('script', src=True)
-        
-        for script in scripts:
+
+        for script in tree.xpath('//script[@src]'):
             src = script.get('src')
-            if src and src in self.downloaded_assets:
-                # Create inline script
-                script['src'] = None  # Remove src attribute
-                script.string = self.downloaded_assets[src] 
\ No newline at end of file
+            if src:
+                script_url = urljoin(base_url, src)
+                if script_url in self.downloaded_assets:
+                    # Create inline script
+                    del script.attrib['src']
+                    script.text = self.downloaded_assets[script_url]
@@ -0,0 +1,111 @@
+import asyncio
+from typing import List, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext
+
+# Flags shared by every pooled Chromium instance (same set the scraper
+# has always launched with)
+_LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-accelerated-2d-canvas',
+    '--no-first-run',
+    '--no-zygote',
+    '--disable-gpu',
+]
+
+
+class BrowserPool:
+    """
+    A small pool of warm Chromium instances shared by every scraper.
+
+    Browser launch costs 1-2s; a fresh BrowserContext is orders of
+    magnitude cheaper. The pool keeps N browsers alive for the life of
+    the app and hands out a new context per acquire, assigned round-robin
+    so concurrent scrapes spread across processes. Contexts are closed on
+    release and never recycled, preserving cookie/cache isolation between
+    scrapes.
+    """
+
+    def __init__(self, size: int = 2):
+        self.size = size
+        self._playwright = None
+        self._browsers: List[Browser] = []
+        self._rr = 0  # round-robin cursor
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """Launch the pool's browsers; idempotent and safe to race."""
+        async with self._lock:
+            if self._browsers:
+                return
+            self._playwright = await async_playwright().start()
+            self._browsers = [
+                await self._playwright.chromium.launch(headless=True, args=_LAUNCH_ARGS)
+                for _ in range(self.size)
+            ]
+
+    async def __aenter__(self) -> "BrowserPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def acquire(self, **context_kwargs) -> BrowserContext:
+        """Create a fresh context on the next warm browser.
+
+        A browser that died since launch is replaced transparently, so a
+        crashed Chromium doesn't poison every later scrape.
+        """
+        if not self._browsers:
+            await self.start()
+
+        self._rr = (self._rr + 1) % len(self._browsers)
+        index = self._rr
+        browser = self._browsers[index]
+        if not browser.is_connected():
+            async with self._lock:
+                browser = self._browsers[index]
+                if not browser.is_connected():
+                    browser = await self._playwright.chromium.launch(
+                        headless=True, args=_LAUNCH_ARGS
+                    )
+                    self._browsers[index] = browser
+        return await browser.new_context(**context_kwargs)
+
+    async def release(self, context: BrowserContext) -> None:
+        """Dispose of a context; the underlying browser stays warm."""
+        await context.close()
+
+    async def close(self) -> None:
+        """Tear down every browser and the playwright driver."""
+        async with self._lock:
+            for browser in self._browsers:
+                if browser.is_connected():
+                    await browser.close()
+            self._browsers = []
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+
+# One pool per process, shared by Scraper, SiteCrawler and the full-site
+# pipeline. Created lazily so importing this module stays side-effect
+# free; shut down from the app lifespan.
+_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
+
+
+async def close_browser_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
@@ -1,9 +1,16 @@
 import asyncio
+import functools
+import hashlib
 import os
+import re
 import time
 from typing import List, Dict, Any, Optional
 from urllib.parse import urlparse, urljoin
 
+from urllib.parse import parse_qsl, urlencode, urlunparse
+
+from lxml import html as lxml_html
+
 from ..models.clone import (
     ScrapeResult, PageCloneResult, FullSiteCloneResult, 
     ScrapeMetadata, CloneRequest
@@ -15,15 +22,129 @@ from .llm import LLMService
 from ..core.logging import LiveLogger
 
 
+_TAG_RE = re.compile(r'<[^>]*>')
+_DIGIT_RE = re.compile(r'\d+')
+
+# Fast-path link rewriting: one pass of a compiled regex over the whole
+# HTML buffer beats building a full lxml tree when only hrefs change.
+# Only quoted hrefs are handled; pages with unquoted ones fall back to lxml.
+_A_HREF_RE = re.compile(r'(<a\b[^>]*?\bhref=)(["\'])(.*?)\2', re.I | re.S)
+_UNQUOTED_HREF_RE = re.compile(r'<a\b[^>]*?\bhref\s*=\s*[^\s"\'>]', re.I)
+
+# Pages whose simhashes differ in at most this many bits are treated as
+# near-duplicates (paginated archives, tag pages, print variants)
+SIMHASH_MAX_DISTANCE = 3
+
+
+def _simhash(html: str) -> int:
+    """
+    64-bit simhash over the page's text content.
+
+    Tags, attributes and digits are stripped first so pagination numbers
+    and timestamps don't separate structurally identical pages.
+    """
+
+    text = _DIGIT_RE.sub('', _TAG_RE.sub(' ', html)).lower()
+    weights = [0] * 64
+
+    for token in text.split():
+        h = int.from_bytes(
+            hashlib.blake2b(token.encode('utf-8', 'ignore'), digest_size=8).digest(),
+            'big'
+        )
+        for i in range(64):
+            weights[i] += 1 if (h >> i) & 1 else -1
+
+    return sum(1 << i for i, w in enumerate(weights) if w > 0)
+
+
+# Process-wide scrape cache: normalized URL -> (fetched_at, result).
+# Collapses crawler aliases (trailing slash, query order) within a run and
+# makes repeat clones of the same site nearly free while the server is up.
+# Bounded: entries hold full page HTML, and without a cap a day of
+# cloning distinct sites would pin every page ever scraped in memory.
+_scrape_cache: Dict[str, tuple] = {}
+SCRAPE_CACHE_TTL = 24 * 3600  # seconds
+_SCRAPE_CACHE_MAX = 128  # comfortably two full-site crawls (max_pages 50)
+
+
+def _scrape_cache_store(cache_key: str, result: ScrapeResult) -> None:
+    """Insert into the scrape cache, evicting expired then oldest entries."""
+    now = time.time()
+    for key in [k for k, v in _scrape_cache.items() if now - v[0] >= SCRAPE_CACHE_TTL]:
+        del _scrape_cache[key]
+    if len(_scrape_cache) >= _SCRAPE_CACHE_MAX:
+        del _scrape_cache[min(_scrape_cache, key=lambda k: _scrape_cache[k][0])]
+    _scrape_cache[cache_key] = (now, result)
+
+
+@functools.lru_cache(maxsize=4096)
+def _strip_query_fragment(url: str) -> str:
+    """Drop query string and fragment. Cached: shared nav menus resolve
+    the same handful of URLs on every page of a site."""
+    return url.split('?', 1)[0].split('#', 1)[0]
+
+
+def _normalize_url(url: str) -> str:
+    """Canonicalize a URL so trivially different aliases share a cache key"""
+
+    parsed = urlparse(url)
+    netloc = parsed.netloc
+    if (parsed.scheme, parsed.port) in (('http', 80), ('https', 443)):
+        netloc = parsed.hostname or netloc
+    query = urlencode(sorted(parse_qsl(parsed.query)))
+    path = parsed.path.rstrip('/') or '/'
+    return urlunparse((parsed.scheme, netloc, path, parsed.params, query, ''))
+
+
+class HostBucket:
+    """
+    Async token bucket enforcing a per-host request rate.
+
+    Unlike a flat sleep between requests, tokens accumulate while a host
+    is idle, so bursts after quiet periods are free while the sustained
+    rate stays capped.
+    """
+
+    def __init__(self, rate_per_sec: float):
+        self.rate = rate_per_sec
+        self.tokens = rate_per_sec
+        self.ts = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def take(self):
+        """Consume one token, sleeping until the refill makes one available"""
+        async with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.ts) * self.rate)
+            self.ts = now
+            if self.tokens < 1.0:
+                wait = (1.0 - self.tokens) / self.rate
+                await asyncio.sleep(wait)
+                self.ts = time.monotonic()
+                self.tokens = 0.0
+            else:
+                self.tokens -= 1.0
+
+
 class FullSiteScraper:
     """Complete website cloning system - discovers, scrapes, and clones entire websites"""
     
-    def __init__(self, logger: LiveLogger):
+    def __init__(self, logger: LiveLogger, concurrency: int = 8,
+                 llm_service: Optional[LLMService] = None):
         self.crawler = None
         self.scraper = Scraper(logger=logger)
-        self.asset_downloader = AssetDownloader()
-        self.llm_service = LLMService(logger=logger)
+        # Accept a shared LLMService so its client pool spans callers
+        self.llm_service = llm_service or LLMService()
         self.logger = logger
+        self.concurrency = concurrency
+        self._scrape_sem = asyncio.Semaphore(concurrency)
+        # Politeness: one token bucket per host, 2 req/s sustained
+        self._buckets: Dict[str, HostBucket] = {}
+        # (simhash, clone) of pages already sent through the LLM, so
+        # near-duplicate pages can reuse the result instead of paying
+        # for another generation
+        self._clone_reps: List[tuple] = []
         
     async def clone_full_website(self, request: CloneRequest) -> FullSiteCloneResult:
         """
@@ -47,40 +168,28 @@ class FullSiteScraper:
             await self.logger.log("\n🕷️ Phase 1: Site Discovery")
             all_urls = await self._discover_all_pages(base_url, request.max_pages)
             
-            # Step 2: Scrape all pages
-            await self.logger.log(f"\n📄 Phase 2: Multi-Page Scraping ({len(all_urls)} pages)")
-            scraped_pages = await self._scrape_all_pages(all_urls)
-            
-            # Step 3: Download and embed assets
-            if request.include_assets:
-                await self.logger.log(f"\n📦 Phase 3: Asset Processing")
-                await self._process_all_assets(scraped_pages)
-            else:
-                await self.logger.log("\n📦 Phase 3: Asset Processing (Skipped)")
-            
-            # Step 4: AI clone generation
-            await self.logger.log(f"\n🧠 Phase 4: AI Cloning with {request.model}")
-            cloned_pages = await self._generate_ai_clones(scraped_pages, request.model)
+            # Steps 2-4: streamed pipeline - each page flows from scraping
+            # into asset embedding and AI cloning as soon as it is ready,
+            # so network I/O overlaps with LLM latency instead of running
+            # as three fully serialized passes
+            await self.logger.log(f"\n📄 Phase 2-4: Scrape → Assets → AI pipeline ({len(all_urls)} pages)")
+            cloned_pages = await self._run_clone_pipeline(all_urls, request)
             
             # Step 5: Fix internal links
             await self.logger.log(f"\n🔗 Phase 5: Link Processing")
-            self._fix_internal_links(cloned_pages)
+            await self._fix_internal_links(cloned_pages)
             
             clone_time = time.time() - start_time
             
-            # Collect all unique assets
-            all_assets = []
+            # Collect all unique assets in one pass - a dict keyed by URL
+            # gives uniqueness and insertion order without a staging list
+            unique_assets_map: Dict[str, Dict[str, Any]] = {}
             for page in cloned_pages:
-                all_assets.extend(page.assets)
-            
-            # Remove duplicates
-            unique_assets = []
-            seen_urls = set()
-            for asset in all_assets:
-                asset_url = asset.get('url', '')
-                if asset_url and asset_url not in seen_urls:
-                    unique_assets.append(asset)
-                    seen_urls.add(asset_url)
+                for asset in page.assets:
+                    asset_url = asset.get('url', '')
+                    if asset_url and asset_url not in unique_assets_map:
+                        unique_assets_map[asset_url] = asset
+            unique_assets = list(unique_assets_map.values())
             
             result = FullSiteCloneResult(
                 base_url=base_url,
@@ -101,7 +210,12 @@ class FullSiteScraper:
         except Exception as e:
             await self.logger.log(f"❌ Full site cloning failed: {str(e)}")
             raise e
-    
+        finally:
+            # Release the job's pooled HTTP client and any Hyperbrowser
+            # fallback session - remote sessions are paid resources and
+            # nothing else closes them when the job ends
+            await self.scraper.aclose()
+
     async def _discover_all_pages(self, base_url: str, max_pages: int) -> List[str]:
         """Discover all pages on the website"""
         
@@ -116,120 +230,191 @@ class FullSiteScraper:
         
         return all_urls
     
-    async def _scrape_all_pages(self, urls: List[str]) -> List[ScrapeResult]:
-        """Scrape all discovered pages"""
-        
-        scraped_pages = []
-        
-        # Process pages in small batches to avoid overwhelming servers
-        batch_size = 3
-        for i in range(0, len(urls), batch_size):
-            batch = urls[i:i + batch_size]
-            
-            await self.logger.log(f"📄 Scraping batch {i//batch_size + 1}/{(len(urls) + batch_size - 1)//batch_size}")
-            
-            # Process batch in parallel
-            tasks = [self.scraper.scrape(url) for url in batch]
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for url, result in zip(batch, batch_results):
-                if isinstance(result, ScrapeResult) and result:
-                    scraped_pages.append(result)
-                    await self.logger.log(f"   ✅ Scraped: {url} ({len(result.html)} chars)")
-                else:
-                    await self.logger.log(f"   ❌ FAILED to scrape: {url}")
-            
-            # Be respectful - small delay between batches
-            await asyncio.sleep(1.0)
-        
-        await self.logger.log(f"✅ Multi-page scraping: {len(scraped_pages)}/{len(urls)} pages scraped successfully")
-        return scraped_pages
-    
-    async def _process_all_assets(self, scraped_pages: List[ScrapeResult]):
-        """Download and embed assets for all pages"""
-        
-        await self.logger.log("📦 Processing assets for all pages...")
-        
-        for i, page in enumerate(scraped_pages):
-            await self.logger.log(f"📦 Processing assets for page {i+1}/{len(scraped_pages)}: {page.url}")
-            
-            try:
-                # Download and embed assets
-                enhanced_html = await self.asset_downloader.download_and_embed_assets(
-                    page.html, page.url
-                )
-                
-                # Update the page HTML with embedded assets
-                page.html = enhanced_html
-                
-                await self.logger.log(f"   ✅ Assets processed for {page.url}")
-                
-            except Exception as e:
-                await self.logger.log(f"   ⚠️ Asset processing failed for {page.url}: {str(e)}")
-            
-            # Small delay to be respectful
-            await asyncio.sleep(0.5)
-    
-    async def _generate_ai_clones(self, scraped_pages: List[ScrapeResult], model: str) -> List[PageCloneResult]:
-        """Generate AI clones for all scraped pages"""
-        
-        cloned_pages = []
-        
-        for i, page in enumerate(scraped_pages):
-            await self.logger.log(f"🧠 AI cloning page {i+1}/{len(scraped_pages)}: {page.url}")
-            
-            try:
-                # Generate AI clone (pass logger to LLM service)
-                llm_result = await self.llm_service.clone_website(page, model, self.logger)
-                
-                # Convert to PageCloneResult
-                parsed_url = urlparse(page.url)
-                page_path = parsed_url.path or '/'
-                
-                clone_page = PageCloneResult(
-                    url=page.url,
-                    path=page_path,
-                    html=llm_result.html,
-                    css=llm_result.css,
-                    screenshot=page.screenshot,
-                    assets=page.assets,
-                    metadata=page.metadata
-                )
-                
-                cloned_pages.append(clone_page)
-                await self.logger.log(f"   ✅ AI clone generated ({len(llm_result.html)} chars)")
-                
-            except Exception as e:
-                await self.logger.log(f"   ❌ AI cloning failed for {page.url}: {str(e)}")
-                # Create fallback page
-                parsed_url = urlparse(page.url)
-                fallback_page = PageCloneResult(
+    async def _scrape_one(self, url: str) -> Optional[ScrapeResult]:
+        """Scrape a single URL under the concurrency and politeness limits"""
+
+        cache_key = _normalize_url(url)
+        cached = _scrape_cache.get(cache_key)
+        if cached and time.time() - cached[0] < SCRAPE_CACHE_TTL:
+            await self.logger.log(f"   ♻️ Cache hit: {url}")
+            # Copy so pipeline stages mutating .html don't poison the cache
+            return cached[1].model_copy(deep=True)
+
+        async with self._scrape_sem:
+            # Throttle per host so workers stay saturated across hosts while
+            # the same server never sees more than the bucket's rate
+            host = urlparse(url).netloc
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = HostBucket(2.0)
+            await bucket.take()
+
+            result = await self.scraper.scrape(url)
+
+        if isinstance(result, ScrapeResult):
+            # Warm the compressed base64 off the loop (the clone pipeline
+            # needs it anyway), then cache without the raw capture: the
+            # ~100KB WebP string serves cache hits in place of multi-MB
+            # screenshot bytes
+            await asyncio.to_thread(lambda: result.screenshot_b64)
+            cached_copy = result.model_copy(deep=True)
+            cached_copy.screenshot_bytes = None
+            _scrape_cache_store(cache_key, cached_copy)
+        return result
+
+    async def _run_clone_pipeline(self, urls: List[str], request: CloneRequest) -> List[PageCloneResult]:
+        """
+        Producer/consumer pipeline: scraper workers feed asset workers feed
+        LLM workers through bounded queues, so each stage starts as soon as
+        a page is available instead of waiting for the previous phase to
+        finish the whole site.
+        """
+
+        url_q: asyncio.Queue = asyncio.Queue()
+        scraped_q: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        assetized_q: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        cloned_pages: List[PageCloneResult] = []
+
+        # Collapse crawler aliases (trailing slash, query order, default
+        # port) before they are ever scheduled - the scrape cache only
+        # catches repeats after the first fetch completes, so concurrent
+        # aliases would otherwise each hit the network
+        seen_urls = set()
+        for url in urls:
+            key = _normalize_url(url)
+            if key in seen_urls:
+                continue
+            seen_urls.add(key)
+            url_q.put_nowait(url)
+
+        async def scrape_worker():
+            while True:
+                url = await url_q.get()
+                try:
+                    result = await self._scrape_one(url)
+                    if isinstance(result, ScrapeResult) and result:
+                        await self.logger.log(f"   ✅ Scraped: {url} ({len(result.html)} chars)")
+                        await scraped_q.put(result)
+                    else:
+                        await self.logger.log(f"   ❌ FAILED to scrape: {url}")
+                except Exception as e:
+                    await self.logger.log(f"   ❌ FAILED to scrape: {url} ({str(e)})")
+                finally:
+                    url_q.task_done()
+
+        async def asset_worker():
+            while True:
+                page = await scraped_q.get()
+                try:
+                    if request.include_assets:
+                        try:
+                            # Fresh downloader per page: the instance keeps
+                            # per-call state (client, queue, styled elements,
+                            # caches) on self, so sharing one across the
+                            # three concurrent workers races pages into
+                            # each other's trees and mid-flight teardowns
+                            page.html = await AssetDownloader().download_and_embed_assets(
+                                page.html, page.url
+                            )
+                            await self.logger.log(f"   ✅ Assets processed for {page.url}")
+                        except Exception as e:
+                            await self.logger.log(f"   ⚠️ Asset processing failed for {page.url}: {str(e)}")
+                    await assetized_q.put(page)
+                finally:
+                    scraped_q.task_done()
+
+        async def clone_worker():
+            while True:
+                page = await assetized_q.get()
+                try:
+                    cloned_pages.append(await self._clone_page(page, request.model))
+                finally:
+                    assetized_q.task_done()
+
+        # Few LLM workers (rate limits), more scrapers (cheap I/O)
+        workers = (
+            [asyncio.create_task(scrape_worker()) for _ in range(self.concurrency)]
+            + [asyncio.create_task(asset_worker()) for _ in range(3)]
+            + [asyncio.create_task(clone_worker()) for _ in range(2)]
+        )
+
+        try:
+            await url_q.join()
+            await scraped_q.join()
+            await assetized_q.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+        await self.logger.log(f"✅ Pipeline complete: {len(cloned_pages)}/{len(urls)} pages cloned")
+        return cloned_pages
+
+    async def _clone_page(self, page: ScrapeResult, model: str) -> PageCloneResult:
+        """Generate the AI clone for one page, falling back to the original HTML"""
+
+        parsed_url = urlparse(page.url)
+
+        # Warm the lazy base64 cache off the event loop; every return
+        # path below reads page.screenshot_b64, and the first access
+        # compresses and encodes a multi-MB capture
+        await asyncio.to_thread(lambda: page.screenshot_b64)
+
+        # Near-duplicate detection: archives, tag pages and print variants
+        # share ~identical DOMs, and the LLM is the most expensive step
+        fingerprint = await asyncio.to_thread(_simhash, page.html)
+        for rep_fingerprint, rep_clone in self._clone_reps:
+            if bin(fingerprint ^ rep_fingerprint).count('1') <= SIMHASH_MAX_DISTANCE:
+                await self.logger.log(f"   ♻️ Near-duplicate of {rep_clone.url}, reusing clone for {page.url}")
+                return PageCloneResult(
                     url=page.url,
                     path=parsed_url.path or '/',
-                    html=page.html,  # Use original HTML as fallback
-                    css=page.css,
-                    screenshot=page.screenshot,
+                    html=rep_clone.html,
+                    css=rep_clone.css,
+                    screenshot=page.screenshot_b64,
                     assets=page.assets,
                     metadata=page.metadata
                 )
-                cloned_pages.append(fallback_page)
-            
-            # Small delay between AI calls
-            await asyncio.sleep(0.5)
-        
-        await self.logger.log(f"✅ AI cloning: {len(cloned_pages)} pages processed")
-        return cloned_pages
+
+        await self.logger.log(f"🧠 AI cloning page: {page.url}")
+
+        try:
+            # Generate AI clone (pass logger to LLM service)
+            llm_result = await self.llm_service.clone_website(page, model, self.logger)
+
+            await self.logger.log(f"   ✅ AI clone generated ({len(llm_result.html)} chars)")
+            clone_page = PageCloneResult(
+                url=page.url,
+                path=parsed_url.path or '/',
+                html=llm_result.html,
+                css=llm_result.css,
+                screenshot=page.screenshot_b64,
+                assets=page.assets,
+                metadata=page.metadata
+            )
+            self._clone_reps.append((fingerprint, clone_page))
+            return clone_page
+
+        except Exception as e:
+            await self.logger.log(f"   ❌ AI cloning failed for {page.url}: {str(e)}")
+            # Create fallback page
+            return PageCloneResult(
+                url=page.url,
+                path=parsed_url.path or '/',
+                html=page.html,  # Use original HTML as fallback
+                css=page.css,
+                screenshot=page.screenshot_b64,
+                assets=page.assets,
+                metadata=page.metadata
+            )
     
-    def _fix_internal_links(self, cloned_pages: List[PageCloneResult]):
+    async def _fix_internal_links(self, cloned_pages: List[PageCloneResult]):
         """Fix internal links to work within the cloned site for offline browsing."""
-        
-        self.logger.log("🔗 Fixing internal links for offline navigation...")
-        
+
         # Step 1: Create a mapping of original URLs to their new file paths.
         url_to_filepath = {}
         for page in cloned_pages:
-            path = urlparse(page.url.split('?')[0].split('#')[0]).path
-            
+            path = urlparse(_strip_query_fragment(page.url)).path
+
             file_path = path.strip('/')
             if not file_path or path == '/':
                 file_path = 'index.html'
@@ -237,48 +422,95 @@ class FullSiteScraper:
                 file_path = os.path.join(file_path, 'index.html')
             elif not os.path.splitext(file_path)[1]:
                 file_path = f'{file_path}.html'
-                
+
             url_to_filepath[page.url] = file_path
             # Also map URL without trailing slash to handle inconsistencies
             if page.url.endswith('/'):
                 url_to_filepath[page.url.rstrip('/')] = file_path
 
-        # Step 2: Iterate over each page and rewrite its internal links.
-        for page in cloned_pages:
-            try:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(page.html, 'html.parser')
-                
-                # The directory of the current page, for calculating relative paths.
-                current_filepath = url_to_filepath.get(page.url, '')
-                current_dir = os.path.dirname(current_filepath)
+        # Shared navigation menus repeat the same (current_dir, target)
+        # pairs on every page - compute each relative path once. Dict
+        # get/set are atomic under the GIL, so sharing across the worker
+        # threads below is safe.
+        relpath_cache: Dict[tuple, str] = {}
 
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    
-                    if not href or href.startswith(('#', 'mailto:', 'tel:')):
-                        continue
-                    
-                    # Resolve the link's URL against the current page's URL.
-                    full_url = urljoin(page.url, href)
-                    clean_url = full_url.split('?')[0].split('#')[0]
-                    
-                    # Check if this resolved URL points to a page we have cloned.
-                    target_filepath = url_to_filepath.get(clean_url)
-                    if not target_filepath and clean_url.endswith('/'):
-                        target_filepath = url_to_filepath.get(clean_url.rstrip('/'))
-
-                    if target_filepath:
-                        # It's an internal link to a cloned page.
-                        # Calculate the relative path from the current page to the target.
-                        relative_path = os.path.relpath(target_filepath, start=current_dir)
-                        link['href'] = relative_path
-                
-                page.html = str(soup)
-            except Exception as e:
-                self.logger.log(f"   ⚠️ Link fixing failed for {page.url}: {str(e)}")
-                
-        self.logger.log("✅ Internal links fixed")
+        # Step 2: Rewrite each page's links off the event loop. The work is
+        # CPU-bound (regex pass or lxml parse+serialize), so running it
+        # inline would stall any overlapping I/O; lxml releases the GIL in
+        # its C parser so threads also buy real parallelism on big pages.
+        await asyncio.gather(*[
+            asyncio.to_thread(self._fix_page_links, page, url_to_filepath, relpath_cache)
+            for page in cloned_pages
+        ])
+
+    def _fix_page_links(
+        self,
+        page: PageCloneResult,
+        url_to_filepath: Dict[str, str],
+        relpath_cache: Dict[tuple, str],
+    ):
+        """Rewrite one page's internal hrefs to relative file paths (CPU-bound)."""
+
+        try:
+            # The directory of the current page, for calculating relative paths.
+            current_filepath = url_to_filepath.get(page.url, '')
+            current_dir = os.path.dirname(current_filepath)
+
+            def map_href(href: str) -> Optional[str]:
+                """Relative path for an internal href, or None to keep it."""
+                if not href or href.startswith(('#', 'mailto:', 'tel:')):
+                    return None
+
+                # Resolve the link's URL against the current page's URL.
+                full_url = urljoin(page.url, href)
+                clean_url = _strip_query_fragment(full_url)
+
+                # Check if this resolved URL points to a page we have cloned.
+                target_filepath = url_to_filepath.get(clean_url)
+                if not target_filepath and clean_url.endswith('/'):
+                    target_filepath = url_to_filepath.get(clean_url.rstrip('/'))
+                if not target_filepath:
+                    return None
+
+                cache_key = (current_dir, target_filepath)
+                relative_path = relpath_cache.get(cache_key)
+                if relative_path is None:
+                    relative_path = os.path.relpath(target_filepath, start=current_dir)
+                    relpath_cache[cache_key] = relative_path
+                return relative_path
+
+            changed = False
+
+            if not _UNQUOTED_HREF_RE.search(page.html):
+                # Fast path: rewrite hrefs with a single regex pass over
+                # the raw buffer - no tree build, no reserialization
+                def rewrite(match: re.Match) -> str:
+                    nonlocal changed
+                    new = map_href(match.group(3))
+                    if new is None:
+                        return match.group(0)
+                    changed = True
+                    quote = match.group(2)
+                    return f'{match.group(1)}{quote}{new}{quote}'
+
+                new_html = _A_HREF_RE.sub(rewrite, page.html)
+                if changed:
+                    page.html = new_html
+            else:
+                # Unusual quoting - let lxml's parser handle it
+                doc = lxml_html.document_fromstring(page.html)
+                for link in doc.xpath('//a[@href]'):
+                    new = map_href(link.get('href'))
+                    if new is not None:
+                        link.set('href', new)
+                        changed = True
+
+                # Serializing ~100KB of HTML is the expensive part - skip
+                # it entirely for pages where no link was rewritten
+                if changed:
+                    page.html = lxml_html.tostring(doc, encoding='unicode')
+        except Exception as e:
+            print(f"   ⚠️ Link fixing failed for {page.url}: {str(e)}")
     
     async def _old_fix_internal_links(self, cloned_pages: List[PageCloneResult], base_url: str):
         """Fix internal links to work within the cloned site"""
@@ -1,9 +1,8 @@
 import asyncio
-import base64
 import os
 from typing import Optional
 
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 from hyperbrowser import AsyncHyperbrowser
 
 from ..core.config import settings
@@ -23,6 +22,54 @@ class HyperbrowserScraper(BaseScraper):
         if not api_key:
             raise ValueError("HYPERBROWSER_API_KEY must be configured to use this scraper.")
         self.client = AsyncHyperbrowser(api_key=api_key)
+        # Lazily-created, reused across scrapes: spinning up a remote
+        # session plus a CDP connection costs seconds per page, so keep
+        # one alive for the lifetime of this scraper instance
+        self._playwright = None
+        self._browser = None
+        self._session = None
+        self._browser_lock = asyncio.Lock()
+
+    async def _ensure_browser(self):
+        """Create (or reuse) the remote session and CDP browser connection.
+
+        Locked: concurrent fallbacks would otherwise each create a paid
+        remote session and the loser's would be overwritten unstopped.
+        """
+        async with self._browser_lock:
+            if self._browser and self._browser.is_connected():
+                return self._browser
+
+            await self.close()
+
+            self._session = await self.client.sessions.create()
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.connect_over_cdp(
+                self._session.ws_endpoint
+            )
+            return self._browser
+
+    async def close(self):
+        """Tear down the remote session and local Playwright driver."""
+        if self._browser:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+        if self._session:
+            try:
+                await self.client.sessions.stop(self._session.id)
+            except Exception as stop_e:
+                if self.logger:
+                    await self.logger.log(f"   - ⚠️ Failed to stop hanging Hyperbrowser session: {stop_e}")
+            self._session = None
 
     async def scrape(self, url: str, viewport_width: int = 1920, viewport_height: int = 1080) -> ScrapeResult:
         """
@@ -39,37 +86,36 @@ class HyperbrowserScraper(BaseScraper):
         if self.logger:
             await self.logger.log(f"💎 Using premium scraper: Hyperbrowser.ai for {url}")
 
-        session = None
         try:
-            session = await self.client.sessions.create()
-            ws_endpoint = session.ws_endpoint
-
-            async with async_playwright() as p:
-                browser = await p.chromium.connect_over_cdp(ws_endpoint)
-                context = browser.contexts[0] if browser.contexts else await browser.new_context()
-                page = context.pages[0] if context.pages else await context.new_page()
+            browser = await self._ensure_browser()
+            context = browser.contexts[0] if browser.contexts else await browser.new_context()
+            page = await context.new_page()
 
+            try:
                 await page.set_viewport_size({"width": viewport_width, "height": viewport_height})
                 await page.goto(url, wait_until="domcontentloaded", timeout=120000)
-                
+
                 if self.logger:
                     await self.logger.log("   - Page loaded, waiting for dynamic content...")
-                await page.wait_for_timeout(5000) # Wait for SPA to hydrate
-
-                html_content = await page.content()
-                
-                # Take screenshot
-                screenshot_bytes = await page.screenshot(full_page=True)
-                screenshot_b64 = base64.b64encode(screenshot_bytes).decode('utf-8')
-
-                # Extract metadata
-                title = await page.title()
-                
-                await browser.close()
+                # Wait for the network to settle rather than a fixed 5s sleep:
+                # fast pages finish in well under a second, and slow SPAs get
+                # up to 8s instead of being captured mid-hydration
+                try:
+                    await page.wait_for_load_state('networkidle', timeout=8000)
+                except PlaywrightTimeout:
+                    pass  # Busy pages never go idle; capture what we have
 
-            # Stop the session cleanly
-            await self.client.sessions.stop(session.id)
-            session = None
+                # Content, screenshot and title are independent CDP commands
+                # multiplexed over one WebSocket - issue them together and
+                # save two round-trips. Screenshot stays raw bytes; base64
+                # happens lazily at the first consumer that needs it.
+                html_content, screenshot_bytes, title = await asyncio.gather(
+                    page.content(),
+                    page.screenshot(full_page=True),
+                    page.title()
+                )
+            finally:
+                await page.close()
 
             if self.logger:
                 await self.logger.log(f"   - ✅ Hyperbrowser scrape successful for {url}")
@@ -81,7 +127,7 @@ class HyperbrowserScraper(BaseScraper):
                 url=url,
                 html=html_content,
                 css="", # Let the vision model handle styling from the screenshot
-                screenshot=screenshot_b64,
+                screenshot_bytes=screenshot_bytes,
                 assets=[],
                 metadata=ScrapeMetadata(
                     title=title,
@@ -96,11 +142,6 @@ class HyperbrowserScraper(BaseScraper):
         except Exception as e:
             if self.logger:
                 await self.logger.log(f"   - ❌ Hyperbrowser scrape failed: {str(e)}")
-            # Ensure session is stopped even if an error occurs
-            if session:
-                try:
-                    await self.client.sessions.stop(session.id)
-                except Exception as stop_e:
-                    if self.logger:
-                        await self.logger.log(f"   - ⚠️ Failed to stop hanging Hyperbrowser session: {stop_e}")
-            raise e 
\ No newline at end of file
+            # A broken session is useless for the next scrape - drop it
+            await self.close()
+            raise e
@@ -1,5 +1,6 @@
 import time
 import asyncio
+import re
 from typing import Dict, Any, Optional
 from ..models.clone import ScrapeResult, LLMCloneResult
 from ..core.config import settings
@@ -8,12 +9,49 @@ from .vision_cloner import VisionCloner
 from ..core.logging import LiveLogger
 
 
+# Strips leading/trailing markdown code fences in one pass instead of
+# chained startswith/endswith checks and slices
+_FENCE_RE = re.compile(r'^\s*```(?:html)?\s*\n?|\n?```\s*$', re.IGNORECASE)
+
+# Wrapper for LLM outputs that are bare fragments rather than documents;
+# built once instead of re-rendering an f-string template per call
+_DEFAULT_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AI Generated Clone</title>
+</head>
+<body>
+"""
+_DEFAULT_TAIL = "\n</body>\n</html>"
+
+
 class LLMService:
     """LLM service for website cloning with real agentic architecture and vision cloning"""
     
     def __init__(self):
         self.model_configs = settings.ai_model_configs
-        self.vision_cloner = VisionCloner()
+        # VisionCloner is only needed for screenshot-backed clones, so
+        # defer its construction until the first vision path runs
+        self._vision_cloner: Optional[VisionCloner] = None
+        # Per-service client cache so every page of a multi-page clone
+        # reuses the same connection pool instead of re-resolving it
+        self._clients: Dict[str, Any] = {}
+
+    @property
+    def vision_cloner(self) -> VisionCloner:
+        if self._vision_cloner is None:
+            self._vision_cloner = VisionCloner()
+        return self._vision_cloner
+
+    def _client_for(self, provider: str):
+        """Get a cached client for the provider, creating it on first use."""
+        client = self._clients.get(provider)
+        if client is None:
+            client = LLMClientFactory.get_client(provider)
+            self._clients[provider] = client
+        return client
     
     async def clone_website(
         self, 
@@ -48,8 +86,16 @@ class LLMService:
             config = self.model_configs[model]
             
             # Check if we have a screenshot for vision-enhanced cloning
-            has_screenshot = scrape_data.screenshot and len(scrape_data.screenshot) > 100
+            # (check the raw bytes so we don't force a base64 encode here)
+            has_screenshot = bool(
+                scrape_data.screenshot_bytes and len(scrape_data.screenshot_bytes) > 75
+            ) or bool(scrape_data.screenshot and len(scrape_data.screenshot) > 100)
             
+            # Warm the base64 cache off the event loop: encoding a multi-MB
+            # screenshot inline would stall every other coroutine
+            if has_screenshot and scrape_data.screenshot is None:
+                await asyncio.to_thread(lambda: scrape_data.screenshot_b64)
+
             result: LLMCloneResult
 
             if has_screenshot and model in ["agentic", "precise"]:
@@ -64,7 +110,7 @@ class LLMService:
                     reasoning=agentic_result.get("reasoning", ""),
                     model_used=f"{config['provider']}/{config['model']}",
                     processing_time=0, # This will be set below
-                    screenshot=scrape_data.screenshot # Pass through the original screenshot
+                    screenshot=scrape_data.screenshot_b64 # Pass through the original screenshot
                 )
             else:
                 await logger.log(f"⚡ Using SINGLE-SHOT cloning")
@@ -75,7 +121,7 @@ class LLMService:
                     reasoning=single_shot_result.get("reasoning", ""),
                     model_used=f"{config['provider']}/{config['model']}",
                     processing_time=0, # This will be set below
-                    screenshot=scrape_data.screenshot # Pass through the original screenshot
+                    screenshot=scrape_data.screenshot_b64 # Pass through the original screenshot
                 )
 
             
@@ -112,7 +158,7 @@ class LLMService:
                 reasoning=agentic_result.get("reasoning", "Vision fallback: " + agentic_result.get("reasoning", "")),
                 model_used=f"{config['provider']}/{config['model']}",
                 processing_time=0,
-                screenshot=scrape_data.screenshot
+                screenshot=scrape_data.screenshot_b64
             )
     
     async def _agentic_clone(self, scrape_data: ScrapeResult, config: Dict[str, Any], logger: LiveLogger) -> Dict[str, Any]:
@@ -124,40 +170,38 @@ class LLMService:
         model_name = config["model"]
         max_tokens = config["max_tokens"]
         
-        client = LLMClientFactory.get_client(provider)
+        client = self._client_for(provider)
         
         reasoning_steps = []
         
-        # Agent 1: Layout Analysis
+        # Agents 1 & 2: layout and style analysis are independent (both only
+        # read scrape_data), so run them concurrently; rate limiting is the
+        # client's job, not a sleep between calls
         await logger.log("   - Agent 1: Analyzing layout structure...")
-        layout_prompt = create_website_clone_prompt(scrape_data, "layout_analysis")
-        layout_analysis = await client.generate_response(
-            messages=layout_prompt,
-            model=model_name,
-            max_tokens=1000
-        )
-        reasoning_steps.append(f"🏗️ Layout Analysis:\n{layout_analysis}\n")
-        await logger.log("   - Agent 1: Layout analysis complete.")
-        
-        # Small delay between calls to be respectful to APIs
-        await asyncio.sleep(0.5)
-        
-        # Agent 2: Style Extraction
         await logger.log("   - Agent 2: Extracting design and style...")
-        style_prompt = create_website_clone_prompt(scrape_data, "style_extraction")
-        style_analysis = await client.generate_response(
-            messages=style_prompt,
-            model=model_name,
-            max_tokens=1000
+        layout_prompt, layout_max = create_website_clone_prompt(scrape_data, "layout_analysis")
+        style_prompt, style_max = create_website_clone_prompt(scrape_data, "style_extraction")
+        layout_analysis, style_analysis = await asyncio.gather(
+            client.generate_response(
+                messages=layout_prompt,
+                model=model_name,
+                max_tokens=layout_max
+            ),
+            client.generate_response(
+                messages=style_prompt,
+                model=model_name,
+                max_tokens=style_max
+            )
         )
+        reasoning_steps.append(f"🏗️ Layout Analysis:\n{layout_analysis}\n")
         reasoning_steps.append(f"🎨 Style Analysis:\n{style_analysis}\n")
-        await logger.log("   - Agent 2: Style extraction complete.")
-        
-        await asyncio.sleep(0.5)
-        
+        await logger.log("   - Agents 1 & 2: Layout and style analysis complete.")
+
         # Agent 3: HTML Generation with context from previous agents
         await logger.log("   - Agent 3: Generating final HTML clone...")
-        enhanced_prompt = create_website_clone_prompt(scrape_data, "full")
+        # Model config stays authoritative for the HTML budget, so only
+        # the prompt half of the tuple is used here
+        enhanced_prompt, _ = create_website_clone_prompt(scrape_data, "full")
         
         # Add context from previous agents
         context_message = f"""
@@ -177,15 +221,18 @@ Now create the complete HTML clone incorporating these insights:
             "content": context_message
         })
         
-        html_result = ""
+        # Buffer chunks in a list and join once - repeated += on a large
+        # string reallocates/copies on every chunk
+        chunks = []
         async for chunk in client.generate_streaming_response(
             messages=enhanced_prompt,
             model=model_name,
             max_tokens=max_tokens
         ):
-            html_result += chunk
+            chunks.append(chunk)
             await logger.log(chunk, type='code') # Stream live code to logs
-        
+        html_result = "".join(chunks)
+
         await logger.log("\n   - Agent 3: HTML generation complete.")
         reasoning_steps.append(f"🔨 HTML Generation:\nGenerated complete HTML with {len(html_result)} characters")
         
@@ -218,20 +265,35 @@ Now create the complete HTML clone incorporating these insights:
         model_name = config["model"]
         max_tokens = config["max_tokens"]
         
-        client = LLMClientFactory.get_client(provider)
+        client = self._client_for(provider)
         
         # Create optimized prompt for single-shot generation
-        prompt = create_website_clone_prompt(scrape_data, "full")
-        
-        html_result = ""
-        async for chunk in client.generate_streaming_response(
-            messages=prompt,
-            model=model_name,
-            max_tokens=max_tokens
-        ):
-            html_result += chunk
-            await logger.log(chunk, type='code') # Stream live code to logs
-        
+        prompt, _ = create_website_clone_prompt(scrape_data, "full")
+
+        if settings.race_model_configs:
+            # Race the configured providers with the same prompt and take
+            # the first response. Racing trades live streaming for lower
+            # tail latency, so the code is logged whole once it lands.
+            pairs = [
+                (self.model_configs[name]["provider"], self.model_configs[name]["model"])
+                for name in settings.race_model_configs
+                if name in self.model_configs
+            ]
+            html_result = await LLMClientFactory.race_generate(
+                prompt, pairs, max_tokens=max_tokens
+            )
+            await logger.log(html_result, type='code')
+        else:
+            chunks = []
+            async for chunk in client.generate_streaming_response(
+                messages=prompt,
+                model=model_name,
+                max_tokens=max_tokens
+            ):
+                chunks.append(chunk)
+                await logger.log(chunk, type='code') # Stream live code to logs
+            html_result = "".join(chunks)
+
         html_cleaned = self._clean_html_output(html_result)
         
         reasoning = f"""
@@ -250,30 +312,12 @@ Now create the complete HTML clone incorporating these insights:
     
     def _clean_html_output(self, html_content: str) -> str:
         """Clean and validate HTML output from LLM"""
-        
-        # Remove markdown code blocks if present
-        if html_content.startswith("```html"):
-            html_content = html_content[7:]
-        if html_content.startswith("```"):
-            html_content = html_content[3:]
-        if html_content.endswith("```"):
-            html_content = html_content[:-3]
-        
-        # Ensure we have a complete HTML document
-        html_content = html_content.strip()
-        
+
+        # Remove markdown code blocks if present, then normalize whitespace
+        html_content = _FENCE_RE.sub('', html_content).strip()
+
         if not html_content.startswith("<!DOCTYPE html>") and not html_content.startswith("<html"):
             # If it's just a fragment, wrap it in a basic HTML structure
-            html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AI Generated Clone</title>
-</head>
-<body>
-{html_content}
-</body>
-</html>"""
-        
-        return html_content 
\ No newline at end of file
+            html_content = "".join((_DEFAULT_HEAD, html_content, _DEFAULT_TAIL))
+
+        return html_content
\ No newline at end of file
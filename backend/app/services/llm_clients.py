@@ -1,30 +1,295 @@
 import asyncio
 import base64
-from typing import Dict, Any, Optional, List, AsyncGenerator
+import functools
+import hashlib
+import random
+import re
+import string
+import threading
+import time
+from typing import Dict, Any, Optional, List, AsyncGenerator, Protocol, Tuple
 from abc import ABC, abstractmethod
 
+import tiktoken
+
 import anthropic
+import httpx
 import openai
+import orjson
 import google.generativeai as genai
 from anthropic import AsyncAnthropic
+from google.api_core import exceptions as google_exceptions
 from openai import AsyncOpenAI
 
+# One transport for every provider SDK: HTTP/2 multiplexes the
+# concurrent agent calls over few connections and a generous keepalive
+# pool avoids repeated TLS handshakes across pages. Created lazily so
+# importing this module stays side-effect free.
+_shared_http: Optional[httpx.AsyncClient] = None
+
+
+def _get_shared_http() -> httpx.AsyncClient:
+    global _shared_http
+    if _shared_http is None:
+        _shared_http = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=256, max_keepalive_connections=128),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        )
+    return _shared_http
+
+# Cap on in-flight requests per provider. Rate limiting lives here, in the
+# shared client, so callers can fan out freely without blanket sleeps.
+_MAX_CONCURRENT_REQUESTS = 8
+
+# Transient provider failures worth retrying: rate limits, 5xx and
+# connection drops. Anything else (auth, bad request) fails fast.
+_RETRYABLE_ERRORS = (
+    anthropic.RateLimitError,
+    anthropic.InternalServerError,
+    anthropic.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.APIConnectionError,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+)
+
+
+async def _with_retries(call, max_retries: int = 5, base: float = 0.5, cap: float = 8.0):
+    """Await call() with exponential backoff plus jitter on transient errors.
+
+    call must be a zero-arg factory returning a fresh coroutine, so each
+    attempt re-issues the request without re-running message conversion
+    upstream.
+    """
+    for attempt in range(max_retries):
+        try:
+            return await call()
+        except _RETRYABLE_ERRORS:
+            if attempt == max_retries - 1:
+                raise
+            await asyncio.sleep(min(cap, base * 2 ** attempt) + random.uniform(0, 0.25))
+
 from ..core.config import settings
 from ..models.clone import ScrapeResult
 
 
+class LLMProviderError(Exception):
+    """A provider SDK call failed (after retries, where applicable).
+
+    Keeps the original exception chained so callers can still classify
+    the failure, unlike a bare re-raised Exception.
+    """
+
+    def __init__(self, provider: str, original: Exception):
+        super().__init__(f"{provider} API error: {original}")
+        self.provider = provider
+        self.original = original
+
+
+class CacheBackend(Protocol):
+    """Interface for LLM response cache backends (in-memory, Redis, ...)"""
+
+    async def get(self, key: str) -> Optional[str]: ...
+
+    async def set(self, key: str, value: str) -> None: ...
+
+
+class LLMCache:
+    """
+    In-memory exact-match response cache.
+
+    Deterministic clone steps (layout analysis, style extraction) repeat
+    identical requests for the same page; a hit skips the provider call
+    entirely. Methods are async so a Redis backend can be swapped in
+    behind the same CacheBackend interface.
+    """
+
+    def __init__(self, ttl: float = 3600.0, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[str, tuple] = {}  # key -> (expires_at, text)
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return entry[1]
+
+    async def set(self, key: str, value: str) -> None:
+        if len(self._entries) >= self.maxsize:
+            # Drop the entry closest to expiry
+            oldest = min(self._entries, key=lambda k: self._entries[k][0])
+            self._entries.pop(oldest, None)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+
+_DIGIT_RE = re.compile(r'\d+')
+
+
+def _prompt_fingerprint(model: str, messages: List[Dict[str, Any]]) -> int:
+    """64-bit simhash over the prompt's text parts (images skipped).
+
+    Digits are dropped so trivial URL/pagination variations of the same
+    page land within a few bits of each other.
+    """
+    pieces: List[str] = [model]
+    for msg in messages:
+        content = msg.get("content")
+        if isinstance(content, str):
+            pieces.append(content)
+        elif isinstance(content, list):
+            pieces.extend(
+                part["content"] for part in content
+                if part.get("type") == "text"
+            )
+
+    text = _DIGIT_RE.sub("", "\n".join(pieces)).lower()
+    weights = [0] * 64
+    for token in text.split():
+        h = int.from_bytes(
+            hashlib.blake2b(token.encode("utf-8", "ignore"), digest_size=8).digest(),
+            "big",
+        )
+        for i in range(64):
+            weights[i] += 1 if (h >> i) & 1 else -1
+    return sum(1 << i for i, w in enumerate(weights) if w > 0)
+
+
+class SemanticCache:
+    """
+    Near-duplicate response cache keyed on prompt simhashes.
+
+    Users re-clone the same popular sites with tiny URL or content
+    variations the exact-match cache can't hit. Entries whose
+    fingerprints differ by at most max_distance bits are treated as the
+    same request. The store is a flat list scanned linearly - fine at
+    this maxsize, and it sidesteps an ANN-index dependency.
+    """
+
+    def __init__(self, max_distance: int = 3, ttl: float = 3600.0, maxsize: int = 256):
+        self.max_distance = max_distance
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: List[tuple] = []  # (fingerprint, expires_at, text)
+
+    async def get(self, fingerprint: int) -> Optional[str]:
+        now = time.monotonic()
+        for entry_fp, expires_at, text in self._entries:
+            if expires_at < now:
+                continue
+            if bin(fingerprint ^ entry_fp).count("1") <= self.max_distance:
+                return text
+        return None
+
+    async def set(self, fingerprint: int, value: str) -> None:
+        now = time.monotonic()
+        if len(self._entries) >= self.maxsize:
+            self._entries = [e for e in self._entries if e[1] >= now]
+            if len(self._entries) >= self.maxsize:
+                self._entries.pop(0)  # oldest insertion
+        self._entries.append((fingerprint, now + self.ttl, value))
+
+
+def _response_cache_key(
+    provider: str,
+    model: str,
+    messages: List[Dict[str, Any]],
+    max_tokens: int,
+    kwargs: Dict[str, Any],
+) -> str:
+    """SHA-256 over the canonical request so identical calls share a key"""
+    # orjson emits bytes directly and is several times faster than stdlib
+    # json on the large message payloads hashed here; OPT_SORT_KEYS keeps
+    # the key stable across dict orderings
+    payload = orjson.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "kwargs": kwargs,
+        },
+        option=orjson.OPT_SORT_KEYS,
+        default=str,
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
 class BaseLLMClient(ABC):
     """Base class for LLM clients"""
-    
-    @abstractmethod
+
     async def generate_response(
-        self, 
-        messages: List[Dict[str, Any]], 
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        max_tokens: int = 4000,
+        **kwargs
+    ) -> str:
+        """Generate a response from the LLM, consulting the shared cache.
+
+        Sampled requests (temperature > 0) bypass the cache since their
+        output is intentionally non-deterministic.
+        """
+        if kwargs.get("temperature", 0) > 0:
+            return await self._generate_impl(messages, model, max_tokens, **kwargs)
+
+        key = _response_cache_key(
+            type(self).__name__, model, messages, max_tokens, kwargs
+        )
+        cached = await LLMClientFactory.cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Near-duplicate lookup: a prompt within a few simhash bits of a
+        # recent one (same site, trivial variation) reuses its response.
+        # Fingerprinting walks the full prompt text, so push it off the loop
+        fingerprint = await asyncio.to_thread(_prompt_fingerprint, model, messages)
+        near = await LLMClientFactory.semantic_cache.get(fingerprint)
+        if near is not None:
+            return near
+
+        # Single-flight: if an identical request is already in the air
+        # (concurrent near-duplicate pages hit this constantly), piggyback
+        # on its result instead of paying for a second provider call
+        inflight = LLMClientFactory._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        LLMClientFactory._inflight[key] = future
+        try:
+            text = await self._generate_impl(messages, model, max_tokens, **kwargs)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved for the no-follower case
+            raise
+        else:
+            future.set_result(text)
+            await LLMClientFactory.cache.set(key, text)
+            await LLMClientFactory.semantic_cache.set(fingerprint, text)
+            return text
+        finally:
+            # If the leader was cancelled the except clause never ran;
+            # cancel the future too so followers don't wait forever
+            if not future.done():
+                future.cancel()
+            LLMClientFactory._inflight.pop(key, None)
+
+    @abstractmethod
+    async def _generate_impl(
+        self,
+        messages: List[Dict[str, Any]],
         model: str,
         max_tokens: int = 4000,
         **kwargs
     ) -> str:
-        """Generate a response from the LLM"""
+        """Provider-specific response generation"""
         pass
 
     @abstractmethod
@@ -46,43 +311,67 @@ class AnthropicClient(BaseLLMClient):
         if not settings.anthropic_api_key:
             raise ValueError("ANTHROPIC_API_KEY not configured")
         
-        self.client = AsyncAnthropic(api_key=settings.anthropic_api_key)
-    
-    async def generate_response(
-        self, 
-        messages: List[Dict[str, Any]], 
+        self.client = AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            http_client=_get_shared_http()
+        )
+        self._sem = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+
+    @staticmethod
+    def _split_system(
+        messages: List[Dict[str, Any]]
+    ) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """Partition messages into (system text, Claude message list).
+
+        Every prompt this app builds is already Claude-shaped (one
+        leading system message, then user/assistant turns), so the
+        common case is a slice with zero per-element copies; the rebuild
+        loop only runs for unconventional shapes.
+        """
+        if (
+            messages
+            and messages[0].get("role") == "system"
+            and all(m["role"] in ("user", "assistant") for m in messages[1:])
+        ):
+            return messages[0]["content"], messages[1:]
+
+        system_message = None
+        claude_messages = []
+        for msg in messages:
+            if msg["role"] == "system":
+                system_message = msg["content"]
+            else:
+                claude_messages.append({
+                    "role": msg["role"],
+                    "content": msg["content"]
+                })
+        return system_message, claude_messages
+
+    async def _generate_impl(
+        self,
+        messages: List[Dict[str, Any]],
         model: str = "claude-3-5-sonnet-20241022",
         max_tokens: int = 4000,
         **kwargs
     ) -> str:
         """Generate response using Claude"""
-        
+
         try:
-            # Convert messages to Claude format
-            claude_messages = []
-            system_message = None
-            
-            for msg in messages:
-                if msg["role"] == "system":
-                    system_message = msg["content"]
-                else:
-                    claude_messages.append({
-                        "role": msg["role"],
-                        "content": msg["content"]
-                    })
-            
-            response = await self.client.messages.create(
-                model=model,
-                max_tokens=max_tokens,
-                messages=claude_messages,
-                system=system_message,
-                **kwargs
-            )
-            
+            system_message, claude_messages = self._split_system(messages)
+
+            async with self._sem:
+                response = await _with_retries(lambda: self.client.messages.create(
+                    model=model,
+                    max_tokens=max_tokens,
+                    messages=claude_messages,
+                    system=system_message,
+                    **kwargs
+                ))
+
             return response.content[0].text
             
-        except Exception as e:
-            raise Exception(f"Claude API error: {str(e)}")
+        except anthropic.AnthropicError as e:
+            raise LLMProviderError("anthropic", e) from e
 
     async def generate_streaming_response(
         self, 
@@ -93,30 +382,22 @@ class AnthropicClient(BaseLLMClient):
     ) -> AsyncGenerator[str, None]:
         """Generate a streaming response from Claude."""
         try:
-            # Convert messages to Claude format
-            claude_messages = []
-            system_message = None
-            
-            for msg in messages:
-                if msg["role"] == "system":
-                    system_message = msg["content"]
-                else:
-                    claude_messages.append({
-                        "role": msg["role"],
-                        "content": msg["content"]
-                    })
-            
-            async with self.client.messages.stream(
-                model=model,
-                max_tokens=max_tokens,
-                messages=claude_messages,
-                system=system_message,
-                **kwargs
-            ) as stream:
-                async for text in stream.text_stream:
-                    yield text
-        except Exception as e:
-            raise Exception(f"Claude API streaming error: {str(e)}")
+            system_message, claude_messages = self._split_system(messages)
+
+            async with self._sem:
+                async with self.client.messages.stream(
+                    model=model,
+                    max_tokens=max_tokens,
+                    messages=claude_messages,
+                    system=system_message,
+                    **kwargs
+                ) as stream:
+                    async for text in stream.text_stream:
+                        yield text
+        except anthropic.AnthropicError as e:
+            # Narrow catch keeps CancelledError propagating so a client
+            # disconnect can abort the provider stream
+            raise LLMProviderError("anthropic", e) from e
 
 
 class OpenAIClient(BaseLLMClient):
@@ -126,11 +407,15 @@ class OpenAIClient(BaseLLMClient):
         if not settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY not configured")
         
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=_get_shared_http()
+        )
+        self._sem = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
     
-    async def generate_response(
-        self, 
-        messages: List[Dict[str, Any]], 
+    async def _generate_impl(
+        self,
+        messages: List[Dict[str, Any]],
         model: str = "gpt-4o",
         max_tokens: int = 4000,
         **kwargs
@@ -138,17 +423,18 @@ class OpenAIClient(BaseLLMClient):
         """Generate response using GPT"""
         
         try:
-            response = await self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                max_tokens=max_tokens,
-                **kwargs
-            )
-            
+            async with self._sem:
+                response = await _with_retries(lambda: self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    **kwargs
+                ))
+
             return response.choices[0].message.content
             
-        except Exception as e:
-            raise Exception(f"OpenAI API error: {str(e)}")
+        except openai.OpenAIError as e:
+            raise LLMProviderError("openai", e) from e
 
     async def generate_streaming_response(
         self, 
@@ -159,19 +445,22 @@ class OpenAIClient(BaseLLMClient):
     ) -> AsyncGenerator[str, None]:
         """Generate a streaming response from GPT."""
         try:
-            stream = await self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                max_tokens=max_tokens,
-                stream=True,
-                **kwargs
-            )
-            async for chunk in stream:
-                content = chunk.choices[0].delta.content
-                if content:
-                    yield content
-        except Exception as e:
-            raise Exception(f"OpenAI API streaming error: {str(e)}")
+            async with self._sem:
+                # Retry covers stream establishment; mid-stream failures
+                # propagate since output has already been forwarded
+                stream = await _with_retries(lambda: self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    stream=True,
+                    **kwargs
+                ))
+                async for chunk in stream:
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        yield content
+        except openai.OpenAIError as e:
+            raise LLMProviderError("openai", e) from e
 
 
 class GoogleClient(BaseLLMClient):
@@ -182,10 +471,56 @@ class GoogleClient(BaseLLMClient):
             raise ValueError("GOOGLE_AI_API_KEY not configured")
         
         genai.configure(api_key=settings.google_ai_api_key)
+        self._sem = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+        # GenerativeModel construction re-parses config every time; cache
+        # one wrapper per model name (setdefault is atomic under the GIL)
+        self._model_cache: Dict[str, genai.GenerativeModel] = {}
+
+    def _model_for(self, model: str) -> "genai.GenerativeModel":
+        cached = self._model_cache.get(model)
+        if cached is None:
+            cached = self._model_cache.setdefault(model, genai.GenerativeModel(model))
+        return cached
+
+    _ROLE_MAP = {"user": "user", "assistant": "model"}
+
+    @staticmethod
+    def _to_gemini(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert chat messages to Gemini format in one pass.
+
+        Gemini has no system role, so system text is buffered and joined
+        onto the front of the next user turn instead of mutating parts
+        after the fact.
+        """
+        gemini_messages: List[Dict[str, Any]] = []
+        pending_system: List[str] = []
+
+        for msg in messages:
+            role = msg["role"]
+            if role == "system":
+                pending_system.append(msg["content"])
+                continue
+
+            mapped = GoogleClient._ROLE_MAP.get(role)
+            if mapped is None:
+                continue
+
+            content = msg["content"]
+            if mapped == "user" and pending_system:
+                pending_system.append(content)
+                content = "\n\n".join(pending_system)
+                pending_system = []
+            gemini_messages.append({"role": mapped, "parts": [content]})
+
+        # System text with no following user turn still has to land somewhere
+        if pending_system:
+            gemini_messages.append({"role": "user", "parts": ["\n\n".join(pending_system)]})
+
+        return gemini_messages
     
-    async def generate_response(
-        self, 
-        messages: List[Dict[str, Any]], 
+    async def _generate_impl(
+        self,
+        messages: List[Dict[str, Any]],
         model: str = "gemini-2.0-flash-exp",
         max_tokens: int = 4000,
         **kwargs
@@ -193,46 +528,25 @@ class GoogleClient(BaseLLMClient):
         """Generate response using Gemini"""
         
         try:
-            # Convert messages to Gemini format
-            gemini_messages = []
-            
-            for msg in messages:
-                if msg["role"] == "system":
-                    # Prepend system message to first user message
-                    if gemini_messages and gemini_messages[-1]["role"] == "user":
-                        gemini_messages[-1]["parts"][0] = f"{msg['content']}\n\n{gemini_messages[-1]['parts'][0]}"
-                    else:
-                        gemini_messages.append({
-                            "role": "user",
-                            "parts": [msg["content"]]
-                        })
-                elif msg["role"] == "user":
-                    gemini_messages.append({
-                        "role": "user", 
-                        "parts": [msg["content"]]
-                    })
-                elif msg["role"] == "assistant":
-                    gemini_messages.append({
-                        "role": "model",
-                        "parts": [msg["content"]]
-                    })
-            
-            model_instance = genai.GenerativeModel(model)
-            
-            # Use asyncio to run the sync method
-            response = await asyncio.to_thread(
-                model_instance.generate_content,
-                gemini_messages,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=max_tokens,
-                    **kwargs
-                )
-            )
-            
+            gemini_messages = self._to_gemini(messages)
+
+            model_instance = self._model_for(model)
+
+            # The SDK's native async API keeps the event loop free without
+            # burning a worker thread per call
+            async with self._sem:
+                response = await _with_retries(lambda: model_instance.generate_content_async(
+                    gemini_messages,
+                    generation_config=genai.types.GenerationConfig(
+                        max_output_tokens=max_tokens,
+                        **kwargs
+                    )
+                ))
+
             return response.text
             
-        except Exception as e:
-            raise Exception(f"Google AI API error: {str(e)}")
+        except google_exceptions.GoogleAPIError as e:
+            raise LLMProviderError("google", e) from e
 
     async def generate_streaming_response(
         self, 
@@ -243,79 +557,183 @@ class GoogleClient(BaseLLMClient):
     ) -> AsyncGenerator[str, None]:
         """Generate a streaming response from Gemini."""
         try:
-            # Convert messages to Gemini format
-            gemini_messages = []
-            
-            for msg in messages:
-                if msg["role"] == "system":
-                    # Prepend system message to first user message
-                    if gemini_messages and gemini_messages[-1]["role"] == "user":
-                        gemini_messages[-1]["parts"][0] = f"{msg['content']}\n\n{gemini_messages[-1]['parts'][0]}"
-                    else:
-                        gemini_messages.append({
-                            "role": "user",
-                            "parts": [msg["content"]]
-                        })
-                elif msg["role"] == "user":
-                    gemini_messages.append({
-                        "role": "user", 
-                        "parts": [msg["content"]]
-                    })
-                elif msg["role"] == "assistant":
-                    gemini_messages.append({
-                        "role": "model",
-                        "parts": [msg["content"]]
-                    })
-            
-            model_instance = genai.GenerativeModel(model)
-            
-            # Use asyncio to run the sync method
-            response_stream = await asyncio.to_thread(
-                model_instance.generate_content,
-                gemini_messages,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=max_tokens,
-                    **kwargs
-                ),
-                stream=True
-            )
-            
-            for chunk in response_stream:
-                if chunk.text:
-                    yield chunk.text
+            gemini_messages = self._to_gemini(messages)
 
-        except Exception as e:
-            raise Exception(f"Google AI API streaming error: {str(e)}")
+            model_instance = self._model_for(model)
+
+            # Native async streaming: the old to_thread + sync for-loop
+            # blocked the event loop on every network read between chunks
+            async with self._sem:
+                response_stream = await _with_retries(lambda: model_instance.generate_content_async(
+                    gemini_messages,
+                    generation_config=genai.types.GenerationConfig(
+                        max_output_tokens=max_tokens,
+                        **kwargs
+                    ),
+                    stream=True
+                ))
+
+                async for chunk in response_stream:
+                    if chunk.text:
+                        yield chunk.text
+
+        except google_exceptions.GoogleAPIError as e:
+            raise LLMProviderError("google", e) from e
 
 
 class LLMClientFactory:
     """Factory for creating LLM clients"""
-    
+
     _clients: Dict[str, BaseLLMClient] = {}
-    
+
+    # Shared across all provider clients so a layout analysis cached via
+    # one provider path never re-runs regardless of which client serves it
+    cache: CacheBackend = LLMCache()
+
+    # Fuzzy tier behind the exact cache: catches near-duplicate prompts
+    # (re-clones of popular sites with trivial variations)
+    semantic_cache = SemanticCache()
+
+    # Identical requests currently in flight, keyed like the cache, so
+    # concurrent duplicates coalesce into one provider call
+    _inflight: Dict[str, asyncio.Future] = {}
+
+    # Client construction is synchronous (no awaits), so within one event
+    # loop first-touch is already atomic; the lock covers concurrent
+    # first-touch from worker threads, where two racing constructors
+    # would each open their own connection pool.
+    _init_lock = threading.Lock()
+
+    _PROVIDERS = {
+        "anthropic": AnthropicClient,
+        "openai": OpenAIClient,
+        "google": GoogleClient,
+    }
+
     @classmethod
     def get_client(cls, provider: str) -> BaseLLMClient:
         """Get or create an LLM client for the given provider"""
-        
-        if provider not in cls._clients:
-            if provider == "anthropic":
-                cls._clients[provider] = AnthropicClient()
-            elif provider == "openai":
-                cls._clients[provider] = OpenAIClient()
-            elif provider == "google":
-                cls._clients[provider] = GoogleClient()
-            else:
-                raise ValueError(f"Unsupported LLM provider: {provider}")
-        
-        return cls._clients[provider]
 
+        client = cls._clients.get(provider)
+        if client is not None:
+            return client
 
-def create_website_clone_prompt(scrape_data: ScrapeResult, step: str = "full") -> List[Dict[str, Any]]:
-    """
-    Creates a structured, multi-step prompt for high-fidelity website cloning.
+        client_cls = cls._PROVIDERS.get(provider)
+        if client_cls is None:
+            raise ValueError(f"Unsupported LLM provider: {provider}")
+
+        with cls._init_lock:
+            # Double-checked: another thread may have won the race
+            if provider not in cls._clients:
+                cls._clients[provider] = client_cls()
+            return cls._clients[provider]
+
+    @classmethod
+    async def race_generate(
+        cls,
+        messages: List[Dict[str, Any]],
+        models: List[Tuple[str, str]],
+        max_tokens: int = 4000,
+        **kwargs
+    ) -> str:
+        """Fire the same prompt at several providers, return the first answer.
+
+        Latency-critical steps can trade one wasted in-flight call for
+        min() latency across independent providers. Losers are cancelled
+        as soon as a winner lands; a provider that fails first doesn't end
+        the race, the remaining tasks keep running.
+        """
+        if not models:
+            raise ValueError("race_generate requires at least one (provider, model) pair")
+        tasks = [
+            asyncio.create_task(
+                cls.get_client(provider).generate_response(
+                    messages, model=model, max_tokens=max_tokens, **kwargs
+                )
+            )
+            for provider, model in models
+        ]
+        try:
+            last_error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+            raise last_error  # every provider failed
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    @classmethod
+    async def aclose(cls):
+        """Release cached clients and the shared connection pool."""
+        global _shared_http
+        cls._clients.clear()
+        if _shared_http is not None:
+            await _shared_http.aclose()
+            _shared_http = None
+
+
+# Token budgets for the scraped page context. Character slicing both
+# overshoots (multi-byte text is token-denser than ASCII) and can cut
+# mid-tag; these are sized so the whole prompt fits comfortably in every
+# provider's context window.
+_HTML_TOKEN_BUDGET = 3500
+_CSS_TOKEN_BUDGET = 1500
+
+_TAG_BOUNDARY_RE = re.compile(r'</\w+>')
+_CSS_BOUNDARY_RE = re.compile(r'\}')
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding() -> "tiktoken.Encoding":
+    # o200k_base serves gpt-4o; close enough as a budget yardstick for
+    # the other providers' tokenizers
+    return tiktoken.get_encoding("o200k_base")
+
+
+def _truncate_tokens(text: str, max_tokens: int, boundary_re: re.Pattern = _TAG_BOUNDARY_RE) -> str:
+    """Cut text to a token budget, snapping back to the last boundary
+    (closing tag / CSS rule) so the model never sees a mid-construct cut.
+
+    The input is pre-sliced to max_tokens * 8 chars before tokenizing.
+    Truncation only ever keeps the head, and HTML averages well under 8
+    chars per token, so the cut is unchanged - but asset-inlined pages
+    run to tens of MB, and at tiktoken's ~5MB/s encoding one whole would
+    stall the event loop for seconds per prompt step.
     """
-    
-    system_prompt = """
+    return _truncate_tokens_sliced(text[:max_tokens * 8], max_tokens, boundary_re)
+
+
+@functools.lru_cache(maxsize=32)
+def _truncate_tokens_sliced(text: str, max_tokens: int, boundary_re: re.Pattern) -> str:
+    # Memoized so the layout/style/full steps of one page share a single
+    # encode instead of recomputing the same cut per prompt; the caller's
+    # pre-slice bounds every cached key to max_tokens * 8 chars
+    tokens = _encoding().encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    truncated = _encoding().decode(tokens[:max_tokens])
+    last = None
+    for last in boundary_re.finditer(truncated):
+        pass
+    if last is not None:
+        truncated = truncated[:last.end()]
+    return truncated
+
+
+# Prompt text below is split into immutable prefix blocks and a variable
+# suffix. Providers only grant prompt-cache hits on identical leading
+# tokens, so the static system prompt and per-step instructions come
+# first and the scraped page data goes strictly at the end.
+
+_CLONE_SYSTEM_PROMPT = """
 You are an expert-level frontend developer specializing in creating pixel-perfect, responsive, and production-ready website clones from provided materials. Your task is to generate a single, self-contained HTML file with embedded CSS and, if necessary, JavaScript.
 
 **Core Principles:**
@@ -326,29 +744,40 @@ You are an expert-level frontend developer specializing in creating pixel-perfec
 5.  **Self-Contained:** The final output must be a single HTML file.
 """
 
-    user_prompt_context = f"""
-**Project Context:**
-- **URL:** {scrape_data.url}
-- **Original HTML Structure:** The following is the original HTML structure of the page. Use this as a guide for content, structure, and semantics.
-  ```html
-  {scrape_data.html[:8000]}
-  ```
-- **Original CSS:** The following are some of the original CSS styles. Use these for reference on colors, fonts, and layout, but prioritize the visual accuracy of the screenshot.
-  ```css
-  {scrape_data.css[:4000] if scrape_data.css else "No CSS provided."}
-  ```
-- **Screenshot:** You have access to a screenshot of the page for pixel-perfect visual details.
-"""
+# JSON examples are real Python structures serialized once at import:
+# guarantees the prompt always shows syntactically valid JSON and avoids
+# hand-maintaining indentation inside string literals.
+_LAYOUT_EXAMPLE = {
+    "components": [
+        {"name": "Header", "description": "Contains the logo and main navigation links."},
+        {"name": "HeroSection", "description": "Large hero image with a headline and a call-to-action button."},
+        {"name": "Features", "description": "A three-column grid showcasing product features."},
+        {"name": "Footer", "description": "Contains contact information and social media links."},
+    ]
+}
+
+_STYLE_EXAMPLE = {
+    "palette": [
+        {"name": "--primary-color", "value": "#0A66C2"},
+        {"name": "--text-color", "value": "#333333"},
+        {"name": "--background-color", "value": "#FFFFFF"},
+    ],
+    "typography": {
+        "fontFamily": "'Segoe UI', Roboto, Helvetica, Arial, sans-serif",
+        "baseFontSize": "16px",
+        "headings": {
+            "h1": {"fontSize": "2.5rem", "fontWeight": "600"},
+            "h2": {"fontSize": "2rem", "fontWeight": "500"},
+        },
+    },
+}
 
-    # Base structure for prompts, preparing for vision models
-    # Content is a list to allow for multiple parts (text and image)
-    prompts = {
-        "layout_analysis": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": [
-                {"type": "text", "content": f"""
-{user_prompt_context}
 
+def _json_block(example: Dict[str, Any]) -> str:
+    return orjson.dumps(example, option=orjson.OPT_INDENT_2).decode()
+
+
+_TASK_LAYOUT = f"""
 **Your Task (Step 1 - Layout Analysis):**
 Based on the provided screenshot, HTML structure, and CSS, analyze and deconstruct the website's layout into a high-level component structure.
 
@@ -357,24 +786,11 @@ Return a JSON object describing the components. For each component, specify its
 
 **Example:**
 ```json
-{{
-  "components": [
-    {{"name": "Header", "description": "Contains the logo and main navigation links."}},
-    {{"name": "HeroSection", "description": "Large hero image with a headline and a call-to-action button."}},
-    {{"name": "Features", "description": "A three-column grid showcasing product features."}},
-    {{"name": "Footer", "description": "Contains contact information and social media links."}}
-  ]
-}}
+{_json_block(_LAYOUT_EXAMPLE)}
 ```
-"""}
-            ]}
-        ],
-        "style_extraction": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": [
-                {"type": "text", "content": f"""
-{user_prompt_context}
+"""
 
+_TASK_STYLE = f"""
 **Your Task (Step 2 - Style Extraction):**
 Based on the provided screenshot, HTML, and CSS, extract the key design and style properties.
 
@@ -383,31 +799,11 @@ Return a JSON object containing the color palette and typography details. Use CS
 
 **Example:**
 ```json
-{{
-  "palette": [
-    {{"name": "--primary-color", "value": "#0A66C2"}},
-    {{"name": "--text-color", "value": "#333333"}},
-    {{"name": "--background-color", "value": "#FFFFFF"}}
-  ],
-  "typography": {{
-    "fontFamily": "'Segoe UI', Roboto, Helvetica, Arial, sans-serif",
-    "baseFontSize": "16px",
-    "headings": {{
-      "h1": {{"fontSize": "2.5rem", "fontWeight": "600"}},
-      "h2": {{"fontSize": "2rem", "fontWeight": "500"}}
-    }}
-  }}
-}}
+{_json_block(_STYLE_EXAMPLE)}
 ```
-"""}
-            ]}
-        ],
-        "full": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": [
-                {"type": "text", "content": f"""
-{user_prompt_context}
+"""
 
+_TASK_FULL = """
 **Your Task (Final Step - HTML Generation):**
 Generate the complete, self-contained HTML file for the website. Adhere strictly to the context provided.
 
@@ -416,26 +812,92 @@ Generate the complete, self-contained HTML file for the website. Adhere strictly
 2.  **Embed CSS:** Create a `<style>` tag in the `<head>` and place all CSS there. Use CSS variables for colors as extracted.
 3.  **Match Visuals Perfectly:** The final output must be a pixel-perfect match to the screenshot. Pay close attention to spacing, alignment, colors, and fonts.
 4.  **Output ONLY Code:** Do not add any commentary, explanations, or markdown formatting around the HTML code. Your entire response should be the HTML document itself, starting with `<!DOCTYPE html>`.
-"""}
-            ]}
-        ]
-    }
-    
-    # Add the screenshot image data to the prompt if it exists
-    if scrape_data.screenshot:
-        screenshot_message = {
+"""
+
+_STEP_TASKS = {
+    "layout_analysis": _TASK_LAYOUT,
+    "style_extraction": _TASK_STYLE,
+    "full": _TASK_FULL,
+}
+
+# The static halves of every prompt are built once here and shared as
+# singletons across calls: the system message and per-step task part are
+# identical for every page, so re-allocating them per request (and
+# re-serializing distinct-but-equal objects downstream) is pure waste.
+# Treat these as immutable - prompt builders must never mutate them.
+_SYSTEM_MESSAGE = {"role": "system", "content": _CLONE_SYSTEM_PROMPT}
+
+_STEP_TASK_PARTS = {
+    step: {"type": "text", "content": task} for step, task in _STEP_TASKS.items()
+}
+
+# Recommended output budget per step. The analysis steps return a few
+# hundred tokens of JSON; reserving 4000 for them inflates streaming
+# buffers and, on endpoints that bill reserved output, cost. Only the
+# final HTML step needs a large budget.
+_STEP_MAX_TOKENS = {
+    "layout_analysis": 512,
+    "style_extraction": 512,
+    "full": 6000,
+}
+
+_USER_CTX_TMPL = string.Template("""
+**Project Context:**
+- **URL:** ${url}
+- **Original HTML Structure:** The following is the original HTML structure of the page. Use this as a guide for content, structure, and semantics.
+  ```html
+  ${html}
+  ```
+- **Original CSS:** The following are some of the original CSS styles. Use these for reference on colors, fonts, and layout, but prioritize the visual accuracy of the screenshot.
+  ```css
+  ${css}
+  ```
+- **Screenshot:** You have access to a screenshot of the page for pixel-perfect visual details.
+""")
+
+
+def create_website_clone_prompt(
+    scrape_data: ScrapeResult, step: str = "full"
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Creates a structured, multi-step prompt for high-fidelity website cloning.
+
+    Static instructions lead the message so providers can reuse their
+    prompt-prefix cache; the per-page context (and screenshot) trail it.
+
+    Returns the messages plus the recommended max_tokens for the step so
+    callers don't reserve a full HTML budget for small analysis outputs.
+    """
+
+    user_prompt_context = _USER_CTX_TMPL.substitute(
+        url=scrape_data.url,
+        html=_truncate_tokens(scrape_data.html, _HTML_TOKEN_BUDGET),
+        css=_truncate_tokens(scrape_data.css, _CSS_TOKEN_BUDGET, _CSS_BOUNDARY_RE)
+        if scrape_data.css else "No CSS provided.",
+    )
+
+    # Content is a list to allow for multiple parts (text and image).
+    # The task part is a shared module-level singleton; only the page
+    # context part is allocated per call.
+    user_content: List[Dict[str, Any]] = [
+        _STEP_TASK_PARTS.get(step, _STEP_TASK_PARTS["full"]),
+        {"type": "text", "content": user_prompt_context},
+    ]
+
+    # Add the screenshot image data to the prompt if it exists. The data
+    # URI is built once per ScrapeResult, so the three agent steps all
+    # reference the same string object instead of copying the blob
+    if scrape_data.screenshot_data_url:
+        user_content.append({
             "type": "image_url",
             "image_url": {
-                "url": f"data:image/png;base64,{scrape_data.screenshot}",
+                "url": scrape_data.screenshot_data_url,
                 "detail": "high"
             }
-        }
-        
-        # Add screenshot to all user prompts
-        for key in prompts:
-            user_content = prompts[key][1]["content"]
-            if isinstance(user_content, list):
-                # Append the image part to the content list
-                user_content.append(screenshot_message)
-
-    return prompts.get(step, prompts["full"])
\ No newline at end of file
+        })
+
+    messages = [
+        _SYSTEM_MESSAGE,
+        {"role": "user", "content": user_content},
+    ]
+    return messages, _STEP_MAX_TOKENS.get(step, _STEP_MAX_TOKENS["full"])
\ No newline at end of file
@@ -1,310 +1,436 @@
 import asyncio
-import base64
+import os
 import time
-from typing import Optional, Dict, Any, List
-from playwright.async_api import async_playwright, Browser, Page
+import uuid
+from typing import Literal, Optional, Dict, Any, List
+from urllib.parse import urlsplit, urlunsplit
+from playwright.async_api import Error as PlaywrightError, Page, TimeoutError as PlaywrightTimeout
 import json
 
+from .browser_pool import get_browser_pool
+from ..core.config import settings
 from ..models.clone import ScrapeResult, ScrapeMetadata
 from ..core.logging import LiveLogger
 
 
+def _write_screenshot(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+# How long a memoized ScrapeResult stays valid. Retries and the
+# Playwright->Hyperbrowser fallback re-request the same URLs within
+# seconds; sites don't change meaningfully inside this window.
+SCRAPE_CACHE_TTL = 300.0  # seconds
+# Entries hold full page HTML and raw screenshot bytes, so keep the
+# memo small; eviction is expired-first, then oldest
+SCRAPE_CACHE_MAX = 32
+
+
+# Resource types aborted in html_only mode: none of them affect the
+# served markup, and together they are most of a page's bandwidth
+_BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+
+async def _route_html_only(route) -> None:
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def _cache_key(url: str) -> str:
+    """Canonicalize a URL for memoization: drop the fragment, normalize
+    the trailing slash and sort query params so aliases share an entry."""
+    parts = urlsplit(url)
+    path = parts.path.rstrip('/') or '/'
+    query = '&'.join(sorted(parts.query.split('&'))) if parts.query else ''
+    return urlunsplit((parts.scheme, parts.netloc, path, query, ''))
+
+
+# Evaluate scripts hoisted to module scope: Playwright ships the source
+# text on every Runtime.evaluate, and identical text lets V8's code cache
+# skip re-parsing the (large) extraction function across pages.
+_JS_DESCRIPTION = "() => document.querySelector('meta[name=description]')?.content || ''"
+
+_JS_EXTRACT_ALL = """
+    (baseUrl) => {
+        // camelCase -> kebab-case is the same 29 strings for
+        // every node; pre-kebab them once instead of running a
+        // replace() regex per property per element
+        const PROPS = [
+            ['display', 'display'],
+            ['position', 'position'],
+            ['width', 'width'],
+            ['height', 'height'],
+            ['margin', 'margin'],
+            ['padding', 'padding'],
+            ['backgroundColor', 'background-color'],
+            ['color', 'color'],
+            ['fontSize', 'font-size'],
+            ['fontFamily', 'font-family'],
+            ['fontWeight', 'font-weight'],
+            ['lineHeight', 'line-height'],
+            ['textAlign', 'text-align'],
+            ['border', 'border'],
+            ['borderRadius', 'border-radius'],
+            ['boxShadow', 'box-shadow'],
+            ['backgroundImage', 'background-image'],
+            ['backgroundSize', 'background-size'],
+            ['backgroundPosition', 'background-position'],
+            ['transform', 'transform'],
+            ['opacity', 'opacity'],
+            ['zIndex', 'z-index'],
+            ['flexDirection', 'flex-direction'],
+            ['justifyContent', 'justify-content'],
+            ['alignItems', 'align-items'],
+            ['gridTemplateColumns', 'grid-template-columns'],
+            ['gridTemplateRows', 'grid-template-rows'],
+            ['gap', 'gap']
+        ];
+
+        const result = {
+            title: document.title || '',
+            description: document.querySelector('meta[name="description"]')?.content || '',
+            viewport: document.querySelector('meta[name="viewport"]')?.content || '',
+            assets: [],
+            styles: ''
+        };
+
+        // Images
+        document.querySelectorAll('img').forEach(img => {
+            if (img.src) {
+                result.assets.push({
+                    type: 'image',
+                    url: img.src,
+                    alt: img.alt || '',
+                    element: 'img',
+                    width: img.naturalWidth,
+                    height: img.naturalHeight
+                });
+            }
+        });
+
+        // Stylesheets and fonts
+        document.querySelectorAll('link').forEach(link => {
+            if (!link.href) return;
+            if (link.rel === 'stylesheet') {
+                result.assets.push({
+                    type: 'stylesheet',
+                    url: link.href,
+                    element: 'link'
+                });
+            }
+            if (link.href.includes('font') || link.href.includes('googleapis.com/css')) {
+                result.assets.push({
+                    type: 'font',
+                    url: link.href,
+                    element: 'link'
+                });
+            }
+        });
+
+        // One BFS pass over the DOM covers both the
+        // computed-style dump and the CSS background-image
+        // assets. An explicit queue avoids querySelectorAll('*')
+        // materializing every node up front on huge pages, and
+        // each element's (expensive) style is resolved once.
+        const styles = [];
+        const queue = document.body ? [document.body] : [];
+        for (let i = 0; i < queue.length; i++) {
+            const element = queue[i];
+            for (const child of element.children) {
+                queue.push(child);
+            }
+            const computedStyle = window.getComputedStyle(element);
+
+            if (computedStyle.backgroundImage && computedStyle.backgroundImage !== 'none') {
+                const match = computedStyle.backgroundImage.match(/url\\(["']?([^"'\\)]+)["']?\\)/);
+                if (match) {
+                    result.assets.push({
+                        type: 'background-image',
+                        url: match[1],
+                        element: element.tagName.toLowerCase()
+                    });
+                }
+            }
+
+            if (element.offsetParent !== null) { // Only visible elements
+                const tagName = element.tagName.toLowerCase();
+                const classes = element.className ? '.' + element.className.split(' ').join('.') : '';
+                const id = element.id ? '#' + element.id : '';
+
+                // Create selector
+                let selector = tagName + id + classes;
+                if (!id && !classes) {
+                    selector = tagName + ':nth-child(' + (Array.from(element.parentNode.children).indexOf(element) + 1) + ')';
+                }
+
+                // Build CSS rule; array join beats string
+                // concatenation for large accumulations in V8
+                const parts = [selector, ' {\\n'];
+                for (const [js, css] of PROPS) {
+                    const value = computedStyle[js];
+                    if (value && value !== 'none' && value !== 'auto' && value !== 'normal') {
+                        parts.push('  ', css, ': ', value, ';\\n');
+                    }
+                }
+                parts.push('}\\n\\n');
+
+                styles.push(parts.join(''));
+            }
+        }
+
+        result.styles = styles.join('');
+        return result;
+    }
+"""
+
+
 class PlaywrightScraper:
     """Production-grade browser automation for 100% accurate website capture"""
-    
+
     def __init__(self, logger: Optional[LiveLogger] = None):
-        self.browser: Optional[Browser] = None
-        self.playwright = None
         self.logger = logger
-    
+        # (normalized url, format) -> (fetched_at, ScrapeResult)
+        self._cache: Dict[tuple, tuple] = {}
+
     async def __aenter__(self):
         if self.logger:
-            await self.logger.log("▶️ Launching headless browser...")
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(
-            headless=True,
-            args=[
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-accelerated-2d-canvas',
-                '--no-first-run',
-                '--no-zygote',
-                '--disable-gpu'
-            ]
-        )
+            await self.logger.log("▶️ Warming shared browser pool...")
+        await get_browser_pool().start()
         return self
-    
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
-        if self.logger:
-            await self.logger.log("✅ Headless browser closed.")
-    
-    async def scrape(self, url: str, viewport_width: int = 1920, viewport_height: int = 1080) -> Optional[ScrapeResult]:
+        await self.close()
+
+    async def close(self):
+        """No-op: browsers belong to the process-wide pool.
+
+        Every Scraper and SiteCrawler holds its own PlaywrightScraper, so
+        tearing the pool down here would cold-start the next caller; the
+        app lifespan closes the pool on shutdown instead.
+        """
+
+    async def scrape(
+        self,
+        url: str,
+        viewport_width: int = 1920,
+        viewport_height: int = 1080,
+        screenshot_format: str = "jpeg",
+        wait_for_selector: Optional[str] = None,
+        capture_mode: Literal["full", "html_only"] = "full",
+        wait_until: Literal["domcontentloaded", "commit"] = "domcontentloaded",
+    ) -> Optional[ScrapeResult]:
         """
         Scrape a website using Playwright, with robust waiting logic.
-        
+
         This method waits for the page to be fully loaded, including network
         activity to settle, ensuring that dynamically-loaded content is captured.
-        
+
         Args:
             url: The URL to scrape
-        
+            screenshot_format: "jpeg" (default, 5-10x smaller for full-page
+                captures) or "png" for callers that need lossless.
+            wait_for_selector: optional CSS selector to wait for before
+                capture, for SPAs whose content lands after network idle.
+            capture_mode: "full" captures a screenshot alongside the HTML;
+                "html_only" aborts image/media/font/stylesheet requests and
+                skips the screenshot - link-discovery crawls need neither,
+                and blocking them saves most of a page's bandwidth.
+            wait_until: navigation settle point. "commit" returns as soon
+                as the first response bytes land (short timeout, no
+                network-idle wait) - enough DOM to read anchors from, so
+                discovery crawls don't pay for a full page load.
+
         Returns:
             A ScrapeResult object with HTML, screenshot, and metadata, or None on failure.
         """
         
+        cache_key = (_cache_key(url), screenshot_format, capture_mode)
+        cached = self._cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < SCRAPE_CACHE_TTL:
+            if self.logger:
+                await self.logger.log(f"   ♻️ Reusing recent scrape of {url}")
+            # Copy so pipeline stages mutating .html (asset inlining)
+            # don't poison the cached original
+            return cached[1].model_copy(deep=True)
+
+        pool = get_browser_pool()
+        context = None
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch()
-                context = await browser.new_context(
-                    viewport={'width': viewport_width, 'height': viewport_height}
-                )
-                page = await context.new_page()
-                
-                # Navigate to the page with a generous timeout
-                if self.logger:
-                    await self.logger.log(f"   - Navigating to {url}...")
-                await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                
-                # Additional wait for any final DOM changes and SPA hydration
-                await self.logger.log("   - Page loaded, waiting for dynamic content...")
-                await page.wait_for_timeout(5000) # Increased wait time for SPAs
-                
+            context = await pool.acquire(
+                viewport={'width': viewport_width, 'height': viewport_height}
+            )
+            if capture_mode == "html_only":
+                await context.route("**/*", _route_html_only)
+            page = await context.new_page()
+
+            # Navigate to the page with a generous timeout
+            if self.logger:
+                await self.logger.log(f"   - Navigating to {url}...")
+            nav_timeout = 3000 if wait_until == "commit" else 60000
+            try:
+                await page.goto(url, wait_until=wait_until, timeout=nav_timeout)
+            except PlaywrightTimeout:
+                if wait_until != "commit":
+                    raise
+                # commit-level navigation: whatever HTML arrived is enough
+
+            if wait_until != "commit":
+                # Event-driven settle instead of a flat 5s penalty: most pages
+                # go network-idle in 0.5-2s, and the ceiling caps the ones
+                # that never do (long-polling, analytics beacons)
                 if self.logger:
-                    await self.logger.log("   - Capturing content...")
-
-                # Get page content
-                html = await page.content()
-                
-                # Get a high-quality screenshot
-                screenshot_bytes = await page.screenshot(type="png", full_page=True)
-                screenshot_b64 = base64.b64encode(screenshot_bytes).decode('utf-8')
-                
-                # Get all computed CSS styles
-                # Note: This can be very large and is currently disabled for performance.
-                # Enable if precise CSS replication is needed and performance allows.
-                # css = await page.evaluate('() => { ... }') 
-                
-                # Extract metadata
-                title = await page.title()
-                viewport_size = page.viewport_size or {'width': 0, 'height': 0}
-                
-                metadata = ScrapeMetadata(
-                    title=title,
-                    description=await page.evaluate("() => document.querySelector('meta[name=description]')?.content || ''"),
-                    viewport_width=viewport_size['width'],
-                    viewport_height=viewport_size['height'],
-                    load_time=0,  # Placeholder, can be improved
-                    assets_count=0 # Placeholder, can be improved
+                    await self.logger.log("   - Page loaded, waiting for dynamic content...")
+                try:
+                    await page.wait_for_load_state("networkidle", timeout=8000)
+                except PlaywrightTimeout:
+                    pass  # capture whatever has rendered by the ceiling
+
+            if wait_for_selector:
+                try:
+                    await page.wait_for_selector(wait_for_selector, state="visible", timeout=10000)
+                except PlaywrightTimeout:
+                    if self.logger:
+                        await self.logger.log(f"   - ⚠️ Selector {wait_for_selector} never appeared; capturing anyway")
+
+            if self.logger:
+                await self.logger.log("   - Capturing content...")
+
+            # Screenshot as raw bytes; base64 is produced lazily by
+            # consumers that need a data URI. A full-page PNG easily runs
+            # to megabytes, and the capture only guides visual cloning, so
+            # JPEG quality 85 is the default
+            if capture_mode == "html_only":
+                screenshot_bytes = None
+                html, title, description = await asyncio.gather(
+                    page.content(),
+                    page.title(),
+                    page.evaluate(_JS_DESCRIPTION),
                 )
-                
-                await browser.close()
-                
-                if self.logger:
-                    await self.logger.log("   - ✅ Content capture complete.")
-                
-                return ScrapeResult(
-                    url=url,
-                    html=html,
-                    css="", # CSS is now inline or linked, not extracted separately here
-                    screenshot=screenshot_b64,
-                    assets=[], # Asset downloader will handle this later
-                    metadata=metadata
+            else:
+                screenshot_kwargs: Dict[str, Any] = {
+                    "type": screenshot_format,
+                    "full_page": True,
+                }
+                if screenshot_format == "jpeg":
+                    screenshot_kwargs["quality"] = 85
+
+                # Content, screenshot, title and description are independent
+                # CDP calls; gathering them overlaps the ~1s screenshot with
+                # the sub-ms fetches instead of paying for them back to back
+                html, screenshot_bytes, title, description = await asyncio.gather(
+                    page.content(),
+                    page.screenshot(**screenshot_kwargs),
+                    page.title(),
+                    page.evaluate(_JS_DESCRIPTION),
                 )
-        
-        except Exception as e:
+
+            # Get all computed CSS styles
+            # Note: This can be very large and is currently disabled for performance.
+            # Enable if precise CSS replication is needed and performance allows.
+            # css = await page.evaluate('() => { ... }')
+
+            viewport_size = page.viewport_size or {'width': 0, 'height': 0}
+
+            # Persist the capture and reference it by URL so API payloads
+            # can carry a path instead of megabytes of base64; vision
+            # consumers still base64-encode lazily from the bytes
+            screenshot_url = None
+            if screenshot_bytes is not None:
+                suffix = 'jpg' if screenshot_format == 'jpeg' else screenshot_format
+                filename = f"{uuid.uuid4().hex}.{suffix}"
+                try:
+                    await asyncio.to_thread(
+                        _write_screenshot,
+                        os.path.join(settings.screenshot_dir, filename),
+                        screenshot_bytes,
+                    )
+                    screenshot_url = f"/static/screenshots/{filename}"
+                except OSError:
+                    pass  # inline base64 still works without the file
+
+            metadata = ScrapeMetadata(
+                title=title,
+                description=description,
+                viewport_width=viewport_size['width'],
+                viewport_height=viewport_size['height'],
+                load_time=0,  # Placeholder, can be improved
+                screenshot_url=screenshot_url,
+                assets_count=0 # Placeholder, can be improved
+            )
+
+            if self.logger:
+                await self.logger.log("   - ✅ Content capture complete.")
+
+            result = ScrapeResult(
+                url=url,
+                html=html,
+                css="", # CSS is now inline or linked, not extracted separately here
+                screenshot_bytes=screenshot_bytes,
+                assets=[], # Asset downloader will handle this later
+                metadata=metadata
+            )
+            now = time.monotonic()
+            for key in [k for k, v in self._cache.items() if now - v[0] >= SCRAPE_CACHE_TTL]:
+                del self._cache[key]
+            if len(self._cache) >= SCRAPE_CACHE_MAX:
+                del self._cache[min(self._cache, key=lambda k: self._cache[k][0])]
+            self._cache[cache_key] = (now, result.model_copy(deep=True))
+            return result
+
+        except PlaywrightError as e:
+            # A browser that died mid-scrape is replaced by the pool on
+            # the next acquire, so no recovery is needed here. Anything
+            # that isn't a browser failure (notably CancelledError during
+            # shutdown) propagates instead of being swallowed.
             print(f"Playwright scraping failed for {url}: {str(e)}")
             return None
+        finally:
+            if context is not None:
+                await pool.release(context)
     
-    async def _extract_computed_styles(self, page: Page) -> str:
-        """Extract computed CSS styles for accurate visual recreation"""
-        
+    async def _extract_all(self, page: Page, base_url: str) -> Dict[str, Any]:
+        """Extract metadata, assets and computed styles in one evaluate.
+
+        Metadata, asset collection and style extraction used to be
+        separate page.evaluate calls - one CDP round-trip each - and the
+        style and background-image passes each walked the full DOM. One
+        script now returns everything and scans the elements once.
+        """
+
         try:
-            # Get computed styles for all visible elements
-            computed_styles = await page.evaluate("""
-                () => {
-                    const styles = [];
-                    const elements = document.querySelectorAll('*');
-                    
-                    elements.forEach((element, index) => {
-                        if (element.offsetParent !== null) { // Only visible elements
-                            const computedStyle = window.getComputedStyle(element);
-                            const tagName = element.tagName.toLowerCase();
-                            const classes = element.className ? '.' + element.className.split(' ').join('.') : '';
-                            const id = element.id ? '#' + element.id : '';
-                            
-                            // Create selector
-                            let selector = tagName + id + classes;
-                            if (!id && !classes) {
-                                selector = tagName + ':nth-child(' + (Array.from(element.parentNode.children).indexOf(element) + 1) + ')';
-                            }
-                            
-                            // Extract key visual properties
-                            const styleProps = {
-                                display: computedStyle.display,
-                                position: computedStyle.position,
-                                width: computedStyle.width,
-                                height: computedStyle.height,
-                                margin: computedStyle.margin,
-                                padding: computedStyle.padding,
-                                backgroundColor: computedStyle.backgroundColor,
-                                color: computedStyle.color,
-                                fontSize: computedStyle.fontSize,
-                                fontFamily: computedStyle.fontFamily,
-                                fontWeight: computedStyle.fontWeight,
-                                lineHeight: computedStyle.lineHeight,
-                                textAlign: computedStyle.textAlign,
-                                border: computedStyle.border,
-                                borderRadius: computedStyle.borderRadius,
-                                boxShadow: computedStyle.boxShadow,
-                                backgroundImage: computedStyle.backgroundImage,
-                                backgroundSize: computedStyle.backgroundSize,
-                                backgroundPosition: computedStyle.backgroundPosition,
-                                transform: computedStyle.transform,
-                                opacity: computedStyle.opacity,
-                                zIndex: computedStyle.zIndex,
-                                flexDirection: computedStyle.flexDirection,
-                                justifyContent: computedStyle.justifyContent,
-                                alignItems: computedStyle.alignItems,
-                                gridTemplateColumns: computedStyle.gridTemplateColumns,
-                                gridTemplateRows: computedStyle.gridTemplateRows,
-                                gap: computedStyle.gap
-                            };
-                            
-                            // Build CSS rule
-                            let cssRule = selector + ' {\\n';
-                            for (const [prop, value] of Object.entries(styleProps)) {
-                                if (value && value !== 'none' && value !== 'auto' && value !== 'normal') {
-                                    const cssProp = prop.replace(/([A-Z])/g, '-$1').toLowerCase();
-                                    cssRule += `  ${cssProp}: ${value};\\n`;
-                                }
-                            }
-                            cssRule += '}\\n\\n';
-                            
-                            styles.push(cssRule);
-                        }
-                    });
-                    
-                    return styles.join('');
-                }
-            """)
-            
-            return computed_styles
-            
+            return await page.evaluate(_JS_EXTRACT_ALL, base_url)
+
         except Exception as e:
-            print(f"❌ Computed styles extraction failed: {str(e)}")
-            return "/* Computed styles extraction failed */"
-    
+            print(f"❌ Page extraction failed: {str(e)}")
+            return {
+                'title': '',
+                'description': '',
+                'viewport': '',
+                'assets': [],
+                'styles': "/* Computed styles extraction failed */"
+            }
+
+    async def _extract_computed_styles(self, page: Page) -> str:
+        """Extract computed CSS styles for accurate visual recreation"""
+        return (await self._extract_all(page, page.url))['styles']
+
     async def _extract_page_assets(self, page: Page, base_url: str) -> List[Dict[str, Any]]:
         """Extract all page assets with full URLs"""
-        
-        try:
-            assets = await page.evaluate("""
-                (baseUrl) => {
-                    const assets = [];
-                    
-                    // Images
-                    document.querySelectorAll('img').forEach(img => {
-                        if (img.src) {
-                            assets.push({
-                                type: 'image',
-                                url: img.src,
-                                alt: img.alt || '',
-                                element: 'img',
-                                width: img.naturalWidth,
-                                height: img.naturalHeight
-                            });
-                        }
-                    });
-                    
-                    // Stylesheets
-                    document.querySelectorAll('link[rel="stylesheet"]').forEach(link => {
-                        if (link.href) {
-                            assets.push({
-                                type: 'stylesheet',
-                                url: link.href,
-                                element: 'link'
-                            });
-                        }
-                    });
-                    
-                    // Fonts
-                    document.querySelectorAll('link').forEach(link => {
-                        if (link.href && (link.href.includes('font') || link.href.includes('googleapis.com/css'))) {
-                            assets.push({
-                                type: 'font',
-                                url: link.href,
-                                element: 'link'
-                            });
-                        }
-                    });
-                    
-                    // Background images from CSS
-                    const elements = document.querySelectorAll('*');
-                    elements.forEach(element => {
-                        const style = window.getComputedStyle(element);
-                        if (style.backgroundImage && style.backgroundImage !== 'none') {
-                            const match = style.backgroundImage.match(/url\\(["']?([^"'\\)]+)["']?\\)/);
-                            if (match) {
-                                assets.push({
-                                    type: 'background-image',
-                                    url: match[1],
-                                    element: element.tagName.toLowerCase()
-                                });
-                            }
-                        }
-                    });
-                    
-                    return assets;
-                }
-            """, base_url)
-            
-            return assets
-            
-        except Exception as e:
-            print(f"❌ Asset extraction failed: {str(e)}")
-            return []
-    
+        return (await self._extract_all(page, base_url))['assets']
+
     async def _extract_page_metadata(self, page: Page, url: str) -> ScrapeMetadata:
         """Extract comprehensive page metadata"""
-        
-        try:
-            metadata = await page.evaluate("""
-                () => {
-                    const title = document.title || '';
-                    const description = document.querySelector('meta[name="description"]')?.content || '';
-                    const viewport = document.querySelector('meta[name="viewport"]')?.content || '';
-                    
-                    return {
-                        title: title,
-                        description: description,
-                        viewport: viewport
-                    };
-                }
-            """)
-            
-            return ScrapeMetadata(
-                title=metadata['title'] or f"Playwright: {url}",
-                description=metadata['description'] or f"Real browser content from {url}",
-                viewport_width=1920,
-                viewport_height=1080,
-                load_time=0,  # Will be set by caller
-                screenshot_url=None,
-                assets_count=0  # Will be set by caller
-            )
-            
-        except Exception as e:
-            print(f"❌ Metadata extraction failed: {str(e)}")
-            return ScrapeMetadata(
-                title=f"Playwright: {url}",
-                description=f"Browser-scraped content from {url}",
-                viewport_width=1920,
-                viewport_height=1080,
-                load_time=0,
-                screenshot_url=None,
-                assets_count=0
-            ) 
\ No newline at end of file
+
+        data = await self._extract_all(page, url)
+        return ScrapeMetadata(
+            title=data['title'] or f"Playwright: {url}",
+            description=data['description'] or f"Real browser content from {url}",
+            viewport_width=1920,
+            viewport_height=1080,
+            load_time=0,  # Will be set by caller
+            screenshot_url=None,
+            assets_count=0  # Will be set by caller
+        )
\ No newline at end of file
@@ -1,7 +1,13 @@
 import asyncio
+import re
+import time
 from typing import Optional
+
+import httpx
+from playwright.async_api import Error as PlaywrightError
+
 from .base_scraper import BaseScraper
-from ..models.clone import ScrapeResult
+from ..models.clone import ScrapeResult, ScrapeMetadata
 from ..core.logging import LiveLogger
 from .playwright_scraper import PlaywrightScraper
 from .hyperbrowser_scraper import HyperbrowserScraper
@@ -10,6 +16,29 @@ from .hyperbrowser_scraper import HyperbrowserScraper
 # from .hyperbrowser_scraper import HyperBrowserScraper
 # from .basic_scraper import BasicScraper
 
+# Hallmarks of client-rendered apps whose raw HTML is an empty shell;
+# such pages must go through a real browser
+_SPA_MARKERS = ('__next_data__', 'ng-app', 'data-reactroot', 'id="root"', "id='root'")
+
+_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.I | re.S)
+_META_DESC_RE = re.compile(
+    r'<meta[^>]+name=["\']description["\'][^>]+content=["\']([^"\']*)', re.I
+)
+
+
+def _looks_static(html: str) -> bool:
+    """Heuristic: can the raw HTML stand in for the rendered page?
+
+    Conservative on purpose - a false positive degrades the clone, a
+    false negative just costs the normal browser scrape.
+    """
+    lower = html.lower()
+    if any(marker in lower for marker in _SPA_MARKERS):
+        return False
+    if lower.count('<script') > 10:
+        return False
+    return '<body' in lower and len(html) > 2000
+
 class Scraper(BaseScraper):
     """
     An orchestrating scraper that uses multiple scraping strategies
@@ -18,6 +47,7 @@ class Scraper(BaseScraper):
     """
     def __init__(self, logger: Optional[LiveLogger] = None):
         self.logger = logger
+        self._http: Optional[httpx.AsyncClient] = None
         self.playwright_scraper = PlaywrightScraper(logger=logger)
         self.hyperbrowser_scraper: Optional[HyperbrowserScraper] = None
         try:
@@ -36,12 +66,88 @@ class Scraper(BaseScraper):
                      print("INFO: ⚠️ HYPERBROWSER_API_KEY not set. Premium fallback scraper is disabled.")
 
 
+    def _http_client(self) -> httpx.AsyncClient:
+        """One pooled HTTP/2 client for all outbound fetches.
+
+        Constructing a client per request discards the connection pool,
+        paying a fresh TLS handshake (50-200ms) for every URL.
+        """
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                http2=True,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                timeout=15.0,
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Release the pooled HTTP client and any fallback browser session.
+
+        The Hyperbrowser session is a paid remote resource kept alive for
+        reuse within a job; without this teardown it would survive until
+        process exit.
+        """
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self.hyperbrowser_scraper is not None:
+            await self.hyperbrowser_scraper.close()
+
+    async def _try_static_scrape(
+        self, url: str, viewport_width: int, viewport_height: int
+    ) -> Optional[ScrapeResult]:
+        """Fetch the URL with plain httpx and keep the result if the page
+        is clearly static - ~200ms versus seconds of browser pipeline.
+
+        No screenshot is taken on this path; HTML-only cloning handles
+        that downstream. Returns None whenever the browser should run.
+        """
+        started = time.time()
+        try:
+            response = await self._http_client().get(url, timeout=10.0)
+        except httpx.HTTPError:
+            return None
+
+        if response.status_code != 200:
+            return None
+        if 'text/html' not in response.headers.get('content-type', ''):
+            return None
+
+        html = response.text
+        if not _looks_static(html):
+            return None
+
+        title_match = _TITLE_RE.search(html)
+        desc_match = _META_DESC_RE.search(html)
+        return ScrapeResult(
+            url=url,
+            html=html,
+            css="",
+            assets=[],
+            metadata=ScrapeMetadata(
+                title=title_match.group(1).strip() if title_match else url,
+                description=desc_match.group(1) if desc_match else "",
+                viewport_width=viewport_width,
+                viewport_height=viewport_height,
+                load_time=time.time() - started,
+                assets_count=0,
+            ),
+        )
+
     async def scrape(self, url: str, viewport_width: int = 1920, viewport_height: int = 1080) -> ScrapeResult:
         """
         Scrapes a website using a fallback strategy.
-        1. Try Playwright for a fast, local scrape.
-        2. If it fails, use the premium Hyperbrowser service.
+        1. Probe with plain httpx and short-circuit for static pages.
+        2. Try Playwright for a fast, local scrape.
+        3. If it fails, use the premium Hyperbrowser service.
         """
+        static_result = await self._try_static_scrape(url, viewport_width, viewport_height)
+        if static_result is not None:
+            if self.logger:
+                await self.logger.log(f"⚡ Static page detected; scraped {url} without a browser.")
+            return static_result
+
         try:
             if self.logger:
                 await self.logger.log(f"▶️ Starting scrape for {url} with standard scraper (Playwright)...")
@@ -49,7 +155,10 @@ class Scraper(BaseScraper):
             if not result or not result.html or len(result.html) < 200: # Basic check for empty or error pages
                  raise ValueError("Playwright returned minimal or empty content.")
             return result
-        except Exception as e:
+        except (PlaywrightError, TimeoutError, ValueError) as e:
+            # Narrow on purpose: a blanket Exception here would also trap
+            # task cancellation and programming errors, hiding shutdown
+            # and real bugs behind the Hyperbrowser fallback
             if self.logger:
                 await self.logger.log(f"⚠️ Playwright scraping failed: {e}")
                 if self.hyperbrowser_scraper:
@@ -1,69 +1,216 @@
-from bs4 import BeautifulSoup
 import asyncio
+from collections import deque
+from typing import Optional
 from urllib.parse import urljoin, urlparse
 
+import httpx
+from lxml import etree
+from lxml import html as lxml_html
+
 from .playwright_scraper import PlaywrightScraper
 
 
+def _extract_links(html: str, page_url: str, base_netloc: str) -> list[str]:
+    """Parse a rendered page and return its same-site absolute links.
+
+    lxml's C parser is roughly an order of magnitude faster than
+    BeautifulSoup over html.parser, and the xpath returns the attribute
+    values directly without building tag wrapper objects. Resolving and
+    filtering the hrefs here too keeps the whole per-page CPU cost in
+    the worker thread it runs on, not the event loop.
+    """
+    try:
+        tree = lxml_html.fromstring(html)
+    except Exception:
+        return []
+
+    links = []
+    for href in tree.xpath('//a/@href'):
+        # Join relative URLs with the page URL and drop fragments
+        full_url = urljoin(page_url, href).split('#')[0]
+        if urlparse(full_url).netloc == base_netloc:
+            links.append(full_url)
+    return links
+
+
 class SiteCrawler:
     """
     Intelligent website crawler that discovers all pages on a site.
     Uses Playwright to render pages and find dynamically-loaded links.
     """
-    
-    def __init__(self, max_pages: int = 50):
+
+    def __init__(self, max_pages: int = 50, concurrency: int = 5):
         self.max_pages = max_pages
+        # Pages scraped in parallel per BFS wave; all workers multiplex
+        # tabs in the scraper's one shared browser
+        self.concurrency = concurrency
         self.scraper = PlaywrightScraper()
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _http_client(self) -> httpx.AsyncClient:
+        """Pooled HTTP/2 client shared by robots/sitemap fetches."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                http2=True,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                timeout=10.0,
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _discover_from_sitemaps(self, base_url: str) -> set[str]:
+        """Enumerate page URLs from robots.txt and sitemap.xml.
+
+        One HTTP round-trip typically lists the whole site, versus
+        seconds of browser rendering per page for BFS discovery.
+        Sitemap indexes are followed one level of nesting at a time.
+        """
+
+        base_netloc = urlparse(base_url).netloc
+        page_urls: set[str] = set()
+        sitemap_queue = deque([urljoin(base_url, '/sitemap.xml')])
+        seen_sitemaps: set[str] = set()
+
+        client = self._http_client()
+
+        # robots.txt may point at non-default sitemap locations
+        try:
+            r = await client.get(urljoin(base_url, '/robots.txt'))
+            if r.status_code == 200:
+                for line in r.text.splitlines():
+                    if line.lower().startswith('sitemap:'):
+                        sitemap_queue.append(line.split(':', 1)[1].strip())
+        except httpx.HTTPError:
+            pass
+
+        while sitemap_queue and len(page_urls) < self.max_pages:
+            sitemap_url = sitemap_queue.popleft()
+            if sitemap_url in seen_sitemaps:
+                continue
+            seen_sitemaps.add(sitemap_url)
+
+            try:
+                r = await client.get(sitemap_url)
+                if r.status_code != 200:
+                    continue
+                tree = etree.fromstring(r.content)
+            except (httpx.HTTPError, etree.XMLSyntaxError):
+                continue
+
+            for loc in tree.iterfind('.//{*}loc'):
+                text = (loc.text or '').strip()
+                if not text:
+                    continue
+                parent_tag = loc.getparent().tag
+                if isinstance(parent_tag, str) and parent_tag.endswith('sitemap'):
+                    sitemap_queue.append(text)  # index entry: nested sitemap
+                elif urlparse(text).netloc == base_netloc:
+                    page_urls.add(text.split('#')[0])
+
+        return page_urls
 
     async def discover_all_pages(self, base_url: str) -> list[str]:
         """
         Discovers all unique pages on the website starting from the base URL.
-        
+
         It fetches sitemap.xml, robots.txt, and crawls the site using Playwright
         to find all internal links, including those loaded via JavaScript.
         """
-        
+
         all_urls = set()
-        queue = [base_url]
+        # deque: list.pop(0) is O(n) per pop, O(n^2) over a crawl, which
+        # starts to matter if max_pages is ever raised into the thousands
+        queue = deque([base_url])
         processed_urls = set()
-        
+
         # Add base URL to the set
         all_urls.add(base_url)
-        
-        # TODO: Add sitemap and robots.txt discovery for more comprehensive crawling
-        
-        while queue and len(all_urls) < self.max_pages:
-            url = queue.pop(0)
-            if url in processed_urls:
-                continue
-                
-            processed_urls.add(url)
-            
-            try:
-                # Use PlaywrightScraper to get the page content, which handles JS rendering
-                scraped_content = await self.scraper.scrape(url)
-                
-                if scraped_content and scraped_content.html:
-                    # Find all links on the page
-                    soup = BeautifulSoup(scraped_content.html, 'html.parser')
-                    
-                    for link in soup.find_all('a', href=True):
-                        href = link.get('href')
-                        
-                        # Join relative URLs with the base URL
-                        full_url = urljoin(url, href)
-                        
-                        # Remove fragment identifiers
-                        full_url = full_url.split('#')[0]
-                        
-                        # Check if it's an internal link and not already found
-                        if urlparse(full_url).netloc == urlparse(base_url).netloc:
+
+        # Sitemaps first: a couple of HTTP requests usually enumerate the
+        # whole site, so the per-page browser rendering below becomes a
+        # fallback for sites that don't publish one
+        try:
+            sitemap_urls = await self._discover_from_sitemaps(base_url)
+        except Exception as e:
+            print(f"Sitemap discovery failed for {base_url}: {str(e)}")
+            sitemap_urls = set()
+
+        if sitemap_urls:
+            for url in sitemap_urls:
+                if len(all_urls) >= self.max_pages:
+                    break
+                all_urls.add(url)
+            await self.aclose()
+            return list(all_urls)
+
+        # base_url never changes, so resolve its host once instead of
+        # re-running urlparse for every link on every page
+        base_netloc = urlparse(base_url).netloc
+
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def _scrape_one(url: str):
+            async with sem:
+                # Discovery only needs the anchors; screenshots and
+                # images/fonts/media would be pure wasted bandwidth here,
+                # and anchors are usually in the initial HTML so "commit"
+                # skips the full page-load wait. SPA sites whose links
+                # render late simply contribute fewer discovered URLs.
+                return await self.scraper.scrape(
+                    url, capture_mode="html_only", wait_until="commit"
+                )
+
+        # Scrapes borrow contexts from the process-wide warm browser
+        # pool; close() is a courtesy no-op kept for symmetry.
+        try:
+            while queue and len(all_urls) < self.max_pages:
+                # Drain a wave of up to `concurrency` unvisited URLs and
+                # scrape them in parallel; each scrape is seconds of wall
+                # time, so serial BFS made crawl latency O(n)
+                batch = []
+                while queue and len(batch) < self.concurrency:
+                    url = queue.popleft()
+                    if url in processed_urls:
+                        continue
+                    processed_urls.add(url)
+                    batch.append(url)
+
+                if not batch:
+                    break
+
+                results = await asyncio.gather(
+                    *(_scrape_one(url) for url in batch),
+                    return_exceptions=True
+                )
+
+                # Link extraction stays synchronous - it's cheap next to
+                # the scrapes and keeps queue/all_urls free of races
+                for url, scraped_content in zip(batch, results):
+                    if isinstance(scraped_content, BaseException):
+                        print(f"Could not crawl {url}: {scraped_content}")
+                        continue
+
+                    if scraped_content and scraped_content.html:
+                        # Parse and resolve off the event loop: the work is
+                        # CPU-bound and would otherwise serialize the wave's
+                        # scrapes; lxml releases the GIL in its C parser
+                        new_urls = await asyncio.to_thread(
+                            _extract_links, scraped_content.html, url, base_netloc
+                        )
+
+                        # Only the shared-set bookkeeping stays on the loop
+                        for full_url in new_urls:
                             if full_url not in all_urls:
                                 all_urls.add(full_url)
                                 if len(all_urls) < self.max_pages:
                                     queue.append(full_url)
-                
-            except Exception as e:
-                print(f"Could not crawl {url}: {str(e)}")
-        
-        return list(all_urls) 
\ No newline at end of file
+        finally:
+            await self.scraper.close()
+            await self.aclose()
+
+        return list(all_urls)
@@ -1,8 +1,17 @@
 import asyncio
-import base64
+import functools
+import hashlib
 import time
-from typing import Optional, Dict, Any, List
+
+# pybase64 dispatches to SIMD (AVX2/SSSE3) decode routines, 3-5x faster
+# on multi-MB screenshots; the stdlib scalar decoder is the fallback
+try:
+    from pybase64 import b64decode as _b64decode
+except ImportError:
+    from base64 import b64decode as _b64decode
+from typing import Optional, Dict, Any, List, Tuple
 import httpx
+import orjson
 from PIL import Image
 import io
 
@@ -11,12 +20,132 @@ from ..models.clone import ScrapeResult, LLMCloneResult
 from ..core.logging import LiveLogger
 
 
+# All static instructions live in the system message: OpenAI's implicit
+# prompt cache keys on the identical leading prefix, so keeping every
+# varying field out of it means each call after the first hits the cache
+# for the whole instruction block. Built once at import - rebuilding the
+# multi-KB text as an f-string per clone re-allocated all of it.
+_SYSTEM_CLONE_INSTRUCTIONS = """You are an expert web designer focused on creating pixel-perfect visual clones.
+
+        PIXEL-PERFECT WEBSITE CLONING TASK
+
+        Study the provided website screenshot, then recreate it as a standalone HTML document.
+
+        STEP 1 - ANALYZE the screenshot with extreme detail:
+        - Layout structure: header, navigation, content areas, footer, grid/column layouts
+        - Colors: backgrounds, text, buttons, borders, gradients (hex codes where possible)
+        - Typography: font families, sizes, weights, alignment, line heights
+        - Visual elements: button styles, cards, shadows, image placement, spacing
+        - Measurements: approximate paddings, margins, widths, border radii
+        - Brand identity: visual tone, key design patterns
+
+        STEP 2 - GENERATE a complete HTML document from that analysis:
+        - Match the layout, colors, fonts and spacing pixel-perfectly
+        - Include DOCTYPE, head, and body; embed ALL CSS inline for standalone use
+        - Use modern CSS (Flexbox, Grid, custom properties) with responsive design
+        - Prioritize visual fidelity; include hover effects and transitions
+        - Clean, semantic, cross-browser-compatible markup
+
+        Respond only with a single JSON object of the form:
+        {"analysis": "<your detailed visual analysis>", "html": "<the complete HTML document>"}
+        """
+
+# The user turn carries only the per-clone fields and the image
+_USER_PROMPT_TMPL = """TARGET URL: {url}
+
+        EXTRACTED COLOR PALETTE:
+        {color_palette}
+
+        ORIGINAL HTML CONTEXT:
+        {html_context}...
+        """
+
+
+@functools.lru_cache(maxsize=8)
+def _decode_screenshot(screenshot_b64: str) -> Image.Image:
+    """Decode a base64 screenshot into a small RGB image, memoized.
+
+    Palette extraction is the only consumer and operates on dominant
+    colors, so there is no reason to materialize the full-resolution
+    RGB buffer: draft() lets JPEG decoding skip IDCT scales outright
+    (a no-op for PNG/WebP), and the resize does the rest. Retries and
+    A/B model comparisons re-clone from the same ScrapeResult, and the
+    base64 string is the key, so identical captures hit the cache.
+    Callers must copy() before any in-place mutation.
+    """
+    # validate=True rejects malformed input here instead of as a
+    # confusing truncated-image error inside the PNG/JPEG parser
+    image = Image.open(io.BytesIO(_b64decode(screenshot_b64, validate=True)))
+    image.draft('RGB', (128, 128))
+    image = image.resize((128, 128), Image.Resampling.BILINEAR)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return image
+
+
+# Decode guard: a base64 payload past this is either corrupt or an
+# adversarial input, and decoding it would stall a worker thread and
+# spike memory for no palette benefit (~7.5MB of real image data)
+_MAX_SCREENSHOT_B64 = 10 * 1024 * 1024
+
+_DEFAULT_COLORS = {
+    "dominant": "#ffffff",
+    "accent1": "#f8f9fa",
+    "accent2": "#212529",
+}
+
+
+# Completed (analysis, html) pairs keyed by a hash of the prepared
+# screenshot: re-cloning the same capture (iteration, testing, retries)
+# skips the vision round trip and its token cost entirely.
+_VISION_CACHE_TTL = 24 * 3600.0  # seconds
+_VISION_CACHE_MAX = 32
+_vision_cache: Dict[str, tuple] = {}  # key -> (expires_at, (analysis, html))
+
+
+def _vision_cache_key(screenshot_data_url: str) -> str:
+    return hashlib.blake2b(
+        screenshot_data_url.encode(), digest_size=16
+    ).hexdigest()
+
+
+# One process-wide client for all OpenAI vision calls. VisionCloner is
+# built per clone job, so an instance-held client would still pay TCP+TLS
+# handshakes (100-400ms each) per job; a shared pool reuses keep-alive
+# connections across every concurrent job. Closed via close_vision_http_client
+# in the app's lifespan shutdown.
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_vision_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        # http2: all in-flight vision calls multiplex over one TLS
+        # connection instead of each claiming an HTTP/1.1 stream, so
+        # concurrent clone jobs can't exhaust the pool
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(120.0),
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+    return _http_client
+
+
+async def close_vision_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 class VisionCloner:
     """Screenshot-first cloning using AI vision models for 100% visual accuracy"""
-    
-    def __init__(self):
-        self.timeout = httpx.Timeout(120.0)
-    
+
+    # Shared across all instances: under load, unbounded concurrent
+    # requests trip OpenAI's rate limiter and the resulting 429 retries
+    # blow up p99 latency; queuing client-side keeps requests in order
+    _sem = asyncio.Semaphore(settings.openai_max_concurrency)
+
     async def clone_from_screenshot(
         self, 
         scrape_result: ScrapeResult,
@@ -42,8 +171,10 @@ class VisionCloner:
 
         try:
             url = scrape_result.url
-            screenshot_b64 = scrape_result.screenshot
-            html_content = scrape_result.html
+            # First access compresses and base64-encodes the capture;
+            # run it in a thread so concurrent clones aren't stalled
+            screenshot_b64 = await asyncio.to_thread(lambda: scrape_result.screenshot_b64)
+            html_snippet = scrape_result.html_snippet
             
             if not screenshot_b64:
                 raise ValueError("A screenshot is required for vision-based cloning.")
@@ -52,18 +183,17 @@ class VisionCloner:
             
             start_time = time.time()
             
-            # Step 1: Analyze screenshot with GPT-4 Vision
-            await logger.log("     - Step 1: Analyzing screenshot with GPT-4 Vision...")
-            visual_analysis = await self._analyze_screenshot_with_vision(screenshot_b64, url, logger)
-            
-            # Step 2: Extract color palette from screenshot
-            await logger.log("     - Step 2: Extracting color palette...")
+            # Step 1: local palette extraction feeds the fused prompt
+            await logger.log("     - Step 1: Extracting color palette...")
             color_palette = await self._extract_color_palette(screenshot_b64, logger)
-            
-            # Step 3: Generate HTML based on visual analysis
-            await logger.log("     - Step 3: Generating HTML from vision analysis...")
-            html_result = await self._generate_html_from_vision(
-                visual_analysis, color_palette, url, html_content, logger
+
+            # Step 2: one GPT-4o turn analyzes the screenshot and emits
+            # the HTML - the image is uploaded once and one network
+            # round trip replaces the former analyze-then-generate pair
+            await logger.log("     - Step 2: Analyzing screenshot and generating HTML with GPT-4 Vision...")
+            visual_analysis, html_result = await self._analyze_and_generate(
+                scrape_result.screenshot_data_url, color_palette, url, html_snippet, logger,
+                detail=scrape_result.vision_detail,
             )
             
             processing_time = time.time() - start_time
@@ -82,249 +212,196 @@ class VisionCloner:
             await logger.log(f"   - ❌ Vision cloning failed: {str(e)}")
             raise e
     
-    async def _analyze_screenshot_with_vision(self, screenshot_b64: str, url: str, logger: LiveLogger) -> str:
-        """Analyze screenshot using GPT-4 Vision for detailed layout description"""
-        
+    async def _analyze_and_generate(
+        self,
+        screenshot_data_url: str,
+        color_palette: Dict[str, str],
+        url: str,
+        html_snippet: str,
+        logger: LiveLogger,
+        detail: str = "high",
+    ) -> Tuple[str, str]:
+        """Analyze the screenshot and generate the clone HTML in one call.
+
+        Analysis and generation used to be two sequential gpt-4o requests
+        against the same image - two network round trips and the image
+        billed twice. One JSON-mode turn now returns both fields.
+        """
+
         if not settings.openai_api_key:
             raise ValueError("OpenAI API key required for vision analysis")
-        
-        vision_prompt = f"""
-        PIXEL-PERFECT WEBSITE ANALYSIS TASK
-
-        Analyze this website screenshot with EXTREME DETAIL for 100% accurate recreation:
-
-        TARGET URL: {url}
-
-        PROVIDE COMPREHENSIVE VISUAL ANALYSIS:
-
-        1. **LAYOUT STRUCTURE**:
-           - Exact header layout, height, and positioning
-           - Navigation menu style and alignment
-           - Main content area structure and proportions
-           - Footer design and placement
-           - Grid/column layouts used
-
-        2. **COLOR ANALYSIS**:
-           - Background colors (hex codes if possible)
-           - Text colors for different elements
-           - Button colors and hover states
-           - Border and accent colors
-           - Gradient patterns or solid colors
-
-        3. **TYPOGRAPHY DETAILS**:
-           - Font families and styles used
-           - Font sizes for headings (H1, H2, H3)
-           - Font weights (bold, normal, light)
-           - Text alignment and spacing
-           - Line heights and letter spacing
-
-        4. **VISUAL ELEMENTS**:
-           - Button styles, borders, and shadows
-           - Image placement and sizing
-           - Icon styles and positioning
-           - Card/container designs
-           - Spacing between elements
-
-        5. **SPECIFIC MEASUREMENTS**:
-           - Approximate padding and margins
-           - Element widths and heights
-           - Border radius values
-           - Shadow effects and depth
-
-        6. **BRAND IDENTITY**:
-           - Visual tone and style
-           - Key design patterns
-           - Unique visual elements
-           - Overall aesthetic approach
-
-        Be extremely specific about colors, sizes, positioning, and styling. This analysis will be used to recreate the design with 100% visual accuracy.
-        """
 
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {settings.openai_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "gpt-4o",
-                        "max_tokens": 2000,
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": [
-                                    {
-                                        "type": "text",
-                                        "text": vision_prompt
-                                    },
-                                    {
-                                        "type": "image_url",
-                                        "image_url": {
-                                            "url": f"data:image/png;base64,{screenshot_b64}",
-                                            "detail": "high"
-                                        }
-                                    }
-                                ]
+        cache_key = _vision_cache_key(screenshot_data_url)
+        cached = _vision_cache.get(cache_key)
+        if cached is not None and time.monotonic() < cached[0]:
+            await logger.log("     - ♻️ Reusing cached vision analysis for this screenshot")
+            return cached[1]
+
+        user_prompt = _USER_PROMPT_TMPL.format(
+            url=url,
+            color_palette=color_palette,
+            html_context=html_snippet,
+        )
+
+        body = {
+            "model": "gpt-4o",
+            "max_tokens": 6000,
+            "stream": True,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {
+                    "role": "system",
+                    "content": _SYSTEM_CLONE_INSTRUCTIONS
+                },
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": user_prompt
+                        },
+                        {
+                            "type": "image_url",
+                            # "low" for captures that fit one 85-token
+                            # tile; "high" tiles at ~170 tokens per 512px
+                            # patch and buys nothing below that size
+                            "image_url": {
+                                "url": screenshot_data_url,
+                                "detail": detail
                             }
-                        ]
-                    }
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    analysis = result["choices"][0]["message"]["content"]
-                    await logger.log(f"     - Vision analysis successful ({len(analysis)} chars)")
-                    return analysis
-                else:
-                    await logger.log(f"     - ❌ Vision API failed: {response.status_code}")
-                    return "Vision analysis failed"
-                    
-        except Exception as e:
-            await logger.log(f"     - ❌ Vision analysis error: {str(e)}")
-            return "Vision analysis error"
-    
-    async def _extract_color_palette(self, screenshot_b64: str, logger: LiveLogger) -> Dict[str, str]:
-        """Extract dominant colors from screenshot"""
-        
+                        }
+                    ]
+                }
+            ]
+        }
+
         try:
-            # Decode base64 image
-            image_data = base64.b64decode(screenshot_b64)
-            image = Image.open(io.BytesIO(image_data))
-            
-            # Convert to RGB if needed
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Get dominant colors using simple sampling
-            # Sample from different regions to get background, text, accent colors
-            width, height = image.size
-            
-            colors = {}
-            
-            # Sample background (top-left corner)
-            bg_color = image.getpixel((width // 10, height // 10))
-            colors["background"] = f"rgb({bg_color[0]}, {bg_color[1]}, {bg_color[2]})"
-            
-            # Sample header area
-            header_color = image.getpixel((width // 2, height // 20))
-            colors["header"] = f"rgb({header_color[0]}, {header_color[1]}, {header_color[2]})"
-            
-            # Sample main content area
-            content_color = image.getpixel((width // 2, height // 2))
-            colors["content"] = f"rgb({content_color[0]}, {content_color[1]}, {content_color[2]})"
-            
-            await logger.log(f"     - 🎨 Extracted colors: {colors}")
-            return colors
-            
-        except Exception as e:
-            await logger.log(f"     - ❌ Color extraction failed: {str(e)}")
-            return {
-                "background": "rgb(255, 255, 255)",
-                "header": "rgb(248, 249, 250)",
-                "content": "rgb(255, 255, 255)"
-            }
-    
-    async def _generate_html_from_vision(
-        self, 
-        visual_analysis: str, 
-        color_palette: Dict[str, str], 
-        url: str, 
-        html_content: str,
-        logger: LiveLogger
-    ) -> str:
-        """Generate HTML based on vision analysis"""
-        
-        generation_prompt = f"""
-        PIXEL-PERFECT HTML GENERATION FROM VISION ANALYSIS
+            # Stream the SSE deltas: the model takes 10-30s to emit the
+            # full document, and buffering it all meant the UI stayed
+            # blank that whole time. Each delta is logged as it lands;
+            # parsing still happens once on the assembled buffer.
+            chunks: List[str] = []
+            async with self._sem, get_vision_http_client().stream(
+                "POST",
+                "https://api.openai.com/v1/chat/completions",
+                headers={
+                    "Authorization": f"Bearer {settings.openai_api_key}",
+                    "Content-Type": "application/json"
+                },
+                # orjson emits bytes directly and is several times faster
+                # than the stdlib dumps httpx would use for json=; the
+                # body carries the palette plus 2KB of HTML context
+                content=orjson.dumps(body),
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    await logger.log(f"     - ❌ Vision API failed: {response.status_code}")
+                    return (
+                        "Vision analysis failed",
+                        "<html><body><h1>Vision cloning failed</h1></body></html>",
+                    )
 
-        Create a 100% visually accurate HTML clone based on this detailed analysis:
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    data = line[6:]
+                    if data == "[DONE]":
+                        break
+                    choices = orjson.loads(data).get("choices") or []
+                    if not choices:
+                        continue  # e.g. trailing usage frame
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        chunks.append(delta)
+                        await logger.log(delta)  # Stream live code
 
-        ORIGINAL URL: {url}
+            content = "".join(chunks)
+            try:
+                parsed = orjson.loads(content)
+                analysis = parsed.get("analysis", "")
+                html_output = parsed.get("html", "")
+            except orjson.JSONDecodeError:
+                # JSON mode should prevent this, but a truncated response
+                # can still break the parse; salvage the text as HTML
+                analysis = ""
+                html_output = content
 
-        DETAILED VISUAL ANALYSIS:
-        {visual_analysis}
+            # Clean the output: removeprefix/removesuffix check in place
+            # and copy at most once, versus a full-string slice copy per
+            # matched fence on a ~16KB document
+            html_output = (
+                html_output.removeprefix("```html")
+                .removeprefix("```")
+                .removesuffix("```")
+            )
 
-        EXTRACTED COLOR PALETTE:
-        {color_palette}
+            await logger.log(f"     - Vision analysis successful ({len(analysis)} chars)")
 
-        ORIGINAL HTML CONTEXT:
-        {html_content[:2000]}...
+            # Only successful turns are cached; failures should retry
+            now = time.monotonic()
+            for key in [k for k, v in _vision_cache.items() if v[0] <= now]:
+                del _vision_cache[key]
+            if len(_vision_cache) >= _VISION_CACHE_MAX:
+                del _vision_cache[min(_vision_cache, key=lambda k: _vision_cache[k][0])]
+            result = (analysis, html_output.strip())
+            _vision_cache[cache_key] = (now + _VISION_CACHE_TTL, result)
+            return result
 
-        CRITICAL REQUIREMENTS:
+        except Exception as e:
+            await logger.log(f"     - ❌ Vision cloning error: {str(e)}")
+            return (
+                "Vision analysis error",
+                "<html><body><h1>HTML generation error</h1></body></html>",
+            )
 
-        1. **EXACT VISUAL RECREATION**:
-           - Use the exact colors, fonts, and spacing described in the analysis
-           - Match the layout structure pixel-perfectly
-           - Recreate all visual elements (buttons, cards, etc.) exactly
-           - Maintain the same visual hierarchy and proportions
+    @staticmethod
+    def _extract_color_palette_sync(screenshot_b64: str) -> Dict[str, str]:
+        """CPU half of palette extraction: decode and sample the image.
 
-        2. **COMPLETE HTML DOCUMENT**:
-           - Include DOCTYPE, head, and body sections
-           - Embed ALL CSS inline for standalone functionality
-           - Use modern CSS (Flexbox, Grid, custom properties)
-           - Add responsive design for mobile compatibility
+        Runs inside a worker thread (see _extract_color_palette) so the
+        base64 decode and PNG/JPEG parse never block the event loop.
+        """
+        # Already downsampled by the decoder; quantize() returns a new
+        # image, so the cached one is safe to use directly
+        image = _decode_screenshot(screenshot_b64)
 
-        3. **VISUAL FIDELITY FOCUS**:
-           - Prioritize visual appearance over functionality
-           - Use the extracted colors and visual patterns
-           - Include hover effects and transitions
-           - Ensure typography matches exactly
+        # Median-cut gives a real dominant-color palette; the old three
+        # getpixel probes hit arbitrary points and missed the page's
+        # actual colors whenever one landed on an image or ad
+        quantized = image.quantize(colors=5, method=Image.Quantize.MEDIANCUT)
+        palette = quantized.getpalette()
 
-        4. **TECHNICAL EXCELLENCE**:
-           - Clean, semantic HTML structure
-           - Efficient CSS with proper organization
-           - Cross-browser compatibility
-           - Accessibility considerations
+        # getcolors() yields (pixel_count, palette_index); most frequent
+        # color first so "dominant" is the page background in practice
+        ranked = sorted(quantized.getcolors() or [], reverse=True)
 
-        Generate the complete HTML document that recreates the visual design with 100% accuracy.
+        colors = {}
+        names = ("dominant", "accent1", "accent2", "accent3", "accent4")
+        for name, (_, idx) in zip(names, ranked):
+            r, g, b = palette[idx * 3:idx * 3 + 3]
+            colors[name] = f"#{r:02x}{g:02x}{b:02x}"
 
-        RETURN ONLY THE HTML CODE - NO EXPLANATIONS.
-        """
+        return colors
+
+    async def _extract_color_palette(self, screenshot_b64: str, logger: LiveLogger) -> Dict[str, str]:
+        """Extract dominant colors from screenshot"""
+
+        if not screenshot_b64 or len(screenshot_b64) > _MAX_SCREENSHOT_B64:
+            await logger.log("     - ⚠️ Screenshot missing or oversized; using default palette")
+            return dict(_DEFAULT_COLORS)
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {settings.openai_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "gpt-4o",
-                        "max_tokens": 4000,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are an expert web designer focused on creating pixel-perfect visual clones. Generate only clean HTML with embedded CSS."
-                            },
-                            {
-                                "role": "user",
-                                "content": generation_prompt
-                            }
-                        ]
-                    }
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    html_output = result["choices"][0]["message"]["content"]
-                    
-                    # Clean the output
-                    if html_output.startswith("```html"):
-                        html_output = html_output[7:]
-                    if html_output.startswith("```"):
-                        html_output = html_output[3:]
-                    if html_output.endswith("```"):
-                        html_output = html_output[:-3]
-                    
-                    await logger.log(html_output) # Stream live code
-                    return html_output.strip()
-                else:
-                    await logger.log(f"     - ❌ HTML generation failed: {response.status_code}")
-                    return "<html><body><h1>Vision cloning failed</h1></body></html>"
-                    
+            # A worker thread, not a process pool: since the decoder
+            # drafts down to 128x128 the CPU work is a millisecond or
+            # two, far less than pickling the multi-MB base64 string to
+            # a child process, and PIL's decode releases the GIL anyway
+            colors = await asyncio.to_thread(
+                self._extract_color_palette_sync, screenshot_b64
+            )
+            await logger.log(f"     - 🎨 Extracted colors: {colors}")
+            return colors
+
         except Exception as e:
-            await logger.log(f"     - ❌ HTML generation error: {str(e)}")
-            return "<html><body><h1>HTML generation error</h1></body></html>" 
\ No newline at end of file
+            await logger.log(f"     - ❌ Color extraction failed: {str(e)}")
+            return dict(_DEFAULT_COLORS)
+    